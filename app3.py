@@ -1,12 +1,24 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
 import numpy as np
-import requests
-from io import BytesIO
+import plotly.graph_objects as go
+import pyarrow as pa
+import hashlib
+import functools
+import os
+import time
 import warnings
+import weakref
+from streamlit.logger import get_logger
+from dashboard_data import (
+    DASHBOARD_CSS, KPI_CARDS,
+    fetch_workbook, get_snapshot, collapse_tail, select_cells, cube_positions, cube_counts, select_columns, compute_kpis,
+    build_kpi_card_html, build_category_pie, build_status_pie, build_area_bar, build_category_status_bar,
+    build_timeline, coarsen_timeline, build_engineer_summary_html, build_deadlines_html
+)
+from reports import REPORTS_DIR, load_manifest, match_preset
+from digests import get_live_engine
 warnings.filterwarnings('ignore')
 
 # Page configuration
@@ -17,97 +29,20 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Logs which dashboard sections each rerun rebuilt or reused
+section_log = get_logger('vmware_dashboard.sections')
+
 # Auto-refresh configuration
 REFRESH_INTERVAL = 300  # 5 minutes in seconds
 
-# Custom CSS for professional look - Updated for taller uniform box heights
-st.markdown("""
-    <style>
-    .main-header {
-        font-size: 2.5rem;
-        color: #1E3A8A;
-        font-weight: 600;
-        margin-bottom: 1rem;
-    }
-    .sub-header {
-        font-size: 1.5rem;
-        color: #2563EB;
-        font-weight: 500;
-    }
-    .metric-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 1.5rem;
-        border-radius: 10px;
-        color: white;
-        text-align: center;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        height: 160px;
-        display: flex;
-        flex-direction: column;
-        justify-content: center;
-        align-items: center;
-        margin-bottom: 1rem;
-    }
-    .metric-card h4 {
-        margin: 0;
-        font-size: 1rem;
-        font-weight: 400;
-        opacity: 0.9;
-    }
-    .metric-card h2 {
-        margin: 0.7rem 0 0 0;
-        font-size: 2.5rem;
-        font-weight: 700;
-    }
-    .refresh-badge {
-        position: fixed;
-        top: 10px;
-        right: 10px;
-        background-color: #10B981;
-        color: white;
-        padding: 5px 15px;
-        border-radius: 20px;
-        font-size: 12px;
-        z-index: 999;
-        box-shadow: 0 2px 5px rgba(0,0,0,0.2);
-    }
-    .status-completed {
-        background-color: #10B981;
-        color: white;
-        padding: 0.25rem 0.75rem;
-        border-radius: 20px;
-        font-size: 0.85rem;
-        font-weight: 500;
-    }
-    .status-progress {
-        background-color: #FEF3C7;
-        color: #92400E;
-        padding: 0.25rem 0.75rem;
-        border-radius: 20px;
-        font-size: 0.85rem;
-        font-weight: 500;
-    }
-    .status-notstarted {
-        background-color: #EF4444;
-        color: white;
-        padding: 0.25rem 0.75rem;
-        border-radius: 20px;
-        font-size: 0.85rem;
-        font-weight: 500;
-    }
-    div[data-testid="column"] {
-        display: flex;
-        flex-direction: column;
-    }
-    .chart-container {
-        background-color: white;
-        border-radius: 10px;
-        padding: 1rem;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-        margin-bottom: 1rem;
-    }
-    </style>
-""", unsafe_allow_html=True)
+# Compact payload mode for large orgs (VMWARE_DASHBOARD_COMPACT=0 turns it off): charts keep their
+# top CHART_TOP_N bars plus "Other", and each element sent per rerun is measured and cut to ELEMENT_BUDGET
+COMPACT_MODE = os.environ.get('VMWARE_DASHBOARD_COMPACT', '1') != '0'
+CHART_TOP_N = 15
+ELEMENT_BUDGET = int(os.environ.get('VMWARE_DASHBOARD_ELEMENT_BUDGET', 512 * 1024))  # bytes
+
+# Custom CSS for professional look
+st.markdown(DASHBOARD_CSS, unsafe_allow_html=True)
 
 # Add auto-refresh meta tag
 st.markdown(f"""
@@ -117,173 +52,157 @@ st.markdown(f"""
     </div>
 """, unsafe_allow_html=True)
 
-# OneDrive direct download link function
-def get_direct_link(share_link):
-    """Convert OneDrive sharing link to direct download link"""
-    try:
-        base_url = share_link.split('?')[0]
-        if '/personal/' in base_url:
-            return base_url + '?download=1'
-        else:
-            return base_url.replace('sharepoint.com/:x:', 'sharepoint.com/:x:/') + '?download=1'
-    except Exception as e:
-        st.warning(f"Error creating direct link: {str(e)}")
-        return share_link
-
-def parse_dates(date_str):
-    """Parse dates in DD/MM/YY format"""
-    if pd.isna(date_str) or date_str == '':
-        return pd.NaT
-    
-    try:
-        # Try parsing as DD/MM/YY
-        if isinstance(date_str, str):
-            # Remove any extra spaces
-            date_str = date_str.strip()
-            
-            # Try different date formats
-            for fmt in ['%d/%m/%y', '%d/%m/%Y', '%d-%m-%y', '%d-%m-%Y', '%Y-%m-%d']:
-                try:
-                    return pd.to_datetime(date_str, format=fmt)
-                except:
-                    continue
-            
-            # If specific formats fail, let pandas guess with dayfirst=True
-            return pd.to_datetime(date_str, dayfirst=True)
+def inputs_key(inputs):
+    """Fingerprint a section's declared inputs"""
+    digest = hashlib.sha1()
+    for value in inputs:
+        if isinstance(value, (pd.Series, pd.DataFrame)):
+            digest.update(pd.util.hash_pandas_object(value).to_numpy().tobytes())
+            if isinstance(value, pd.DataFrame):
+                digest.update(repr(list(value.columns)).encode('utf-8'))
+        elif isinstance(value, np.ndarray):
+            digest.update(value.tobytes())
         else:
-            # If it's already a datetime or timestamp
-            return pd.to_datetime(date_str)
-    except:
-        return pd.NaT
-
-def prepare_dates_for_display(df):
-    """Prepare date columns for display to avoid Arrow conversion errors"""
-    df_display = df.copy()
-    
-    # List of date columns to handle
-    date_columns = ['Target Date', 'Completion Date']
+            digest.update(repr(value).encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.hexdigest()
+
+def payload_bytes(output):
+    """Approximate bytes an element sends to the browser: Arrow buffers, plotly JSON or HTML (None if not an element)"""
+    if isinstance(output, pd.DataFrame):
+        return pa.Table.from_pandas(output).nbytes
+    if isinstance(output, go.Figure):
+        return len(output.to_json())
+    if isinstance(output, str):
+        return len(output.encode('utf-8'))
+    return None
+
+def fit_rows(frame):
+    """Cut a table to the leading rows that fit the element budget (row sizes are close to uniform)"""
+    if not COMPACT_MODE or frame.empty:
+        return frame
+    size = payload_bytes(frame)
+    if size <= ELEMENT_BUDGET:
+        return frame
+    return frame.iloc[:int(len(frame) * ELEMENT_BUDGET / size)]
+
+class SectionOutput:
+    """A built section output - sessions whose inputs match hold the same one"""
+    def __init__(self, key, output, build_time, payload):
+        self.key = key
+        self.output = output
+        self.build_time = build_time
+        self.payload = payload
+
+@st.cache_resource
+def shared_section_outputs():
+    """Section outputs by (section, inputs) across all sessions - an output is dropped once no session holds it"""
+    return weakref.WeakValueDictionary()
+
+def cached_section(name, inputs, build):
+    """Return build() for a dashboard section, reusing an output already built for the same inputs"""
+    key = inputs_key(inputs)
+    cache = st.session_state.setdefault('section_cache', {})
+    stats = st.session_state.setdefault('section_stats', {'built': {}, 'reused': {}, 'payload': {}})
+    shared = shared_section_outputs()
     
-    for col in date_columns:
-        if col in df_display.columns:
-            # Convert to datetime first to standardize
-            df_display[col] = pd.to_datetime(df_display[col], errors='coerce')
-            # Then format as string for display
-            df_display[col] = df_display[col].dt.strftime('%d/%m/%y')
-            # Replace 'NaT' strings with empty string
-            df_display[col] = df_display[col].replace('NaT', '')
+    entry = cache.get(name)
+    if entry is None or entry.key != key:
+        # Sessions on the same view share one copy instead of each keeping its own
+        entry = shared.get((name, key))
+    if entry is not None:
+        stats['reused'][name] = entry.build_time
+    else:
+        start = time.perf_counter()
+        output = build()
+        build_time = time.perf_counter() - start
+        # Measured once per build; a reused output is sent again at the same size
+        payload = payload_bytes(output) if COMPACT_MODE else None
+        entry = shared[(name, key)] = SectionOutput(key, output, build_time, payload)
+        stats['built'][name] = build_time
     
-    return df_display
+    cache[name] = entry
+    if entry.payload is not None:
+        stats['payload'][name] = entry.payload
+    return entry.output
+
+def log_section_savings():
+    """Log which sections this rerun rebuilt or reused, and roughly how much time reuse saved"""
+    stats = st.session_state.pop('section_stats', None)
+    if not stats:
+        return
+    section_log.info(
+        "Rerun rebuilt %d section(s) in %.0f ms [%s]; reused %d, saving ~%.0f ms [%s]",
+        len(stats['built']), sum(stats['built'].values()) * 1000, ', '.join(stats['built']),
+        len(stats['reused']), sum(stats['reused'].values()) * 1000, ', '.join(stats['reused'])
+    )
+    if stats['payload']:
+        largest = max(stats['payload'], key=stats['payload'].get)
+        over = [name for name, size in stats['payload'].items() if size > ELEMENT_BUDGET]
+        section_log.info(
+            "Rerun sent ~%.0f KB in %d measured element(s); largest %s (%.0f KB); over the %.0f KB budget: [%s]",
+            sum(stats['payload'].values()) / 1024, len(stats['payload']), largest, stats['payload'][largest] / 1024,
+            ELEMENT_BUDGET / 1024, ', '.join(over)
+        )
 
-# Load data function (no cache for real-time updates)
-def load_data_from_onedrive():
-    """Load Excel data from OneDrive"""
+def dashboard_fragment(func):
+    """st.fragment that also logs section reuse when it reruns on its own"""
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        func(*args, **kwargs)
+        if not st.session_state.get('full_rerun'):
+            log_section_savings()
+    return st.fragment(run)
+
+# Load data function (downloads every run for real-time updates; parsing is cached per data version)
+def load_snapshot_from_onedrive():
+    """Load the Excel snapshot from OneDrive"""
     try:
-        # Your OneDrive sharing link
-        share_link = "https://jafferbrothers-my.sharepoint.com/:x:/g/personal/customercare_jbs_live/IQAb-s-HyehHTabXHhqu0FTWAVKn9D-CnZ0YH5kw1BZDOGA?e=0RVyMd"
-        
-        # Get direct download link
-        direct_link = get_direct_link(share_link)
-        
-        # Add headers to mimic a browser request
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        # Download the file
-        response = requests.get(direct_link, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        # Read Excel from the response content
-        df = pd.read_excel(BytesIO(response.content), sheet_name="for dashboard", engine='openpyxl')
-        
-        # Clean column names
-        df.columns = df.columns.str.strip()
-        
-        # Rename the first column if it has the long name
-        first_col = df.columns[0]
-        if 'Sales / Pre-Sales / Post-Sales' in first_col:
-            df.rename(columns={first_col: 'Category'}, inplace=True)
-        
-        # Rename status column
-        status_col = None
-        for col in df.columns:
-            if 'Status' in col:
-                status_col = col
-                break
-        
-        if status_col:
-            df.rename(columns={status_col: 'Status'}, inplace=True)
-        
-        # Convert Target Date to datetime with DD/MM/YY format handling
-        if 'Target Date' in df.columns:
-            # Apply date parsing function
-            df['Target Date'] = df['Target Date'].apply(parse_dates)
-        
-        # Convert Completion Date to datetime if it exists
-        if 'Completion Date' in df.columns:
-            df['Completion Date'] = df['Completion Date'].apply(parse_dates)
-        
-        # Calculate days remaining
-        if 'Target Date' in df.columns:
-            df['Days Remaining'] = (df['Target Date'] - pd.Timestamp.now()).dt.days
-        
-        # Clean status values
-        if 'Status' in df.columns:
-            df['Status'] = df['Status'].fillna('Not Started').replace('', 'Not Started')
-            df['Status'] = df['Status'].str.strip()
-            # Standardize status values
-            df['Status'] = df['Status'].replace({
-                'In progress': 'In Progress',
-                'in progress': 'In Progress',
-                'completed': 'Completed',
-                'Completed': 'Completed',
-                'not started': 'Not Started'
-            })
-        else:
-            df['Status'] = 'Not Started'
-        
-        return df
+        return get_snapshot(fetch_workbook(), warn=st.warning)
     
     except Exception as e:
         st.error(f"❌ Error loading from OneDrive: {str(e)}")
-        return pd.DataFrame()
+        return None
 
 # Load data
 with st.spinner("🔄 Loading latest data from OneDrive..."):
-    df = load_data_from_onedrive()
+    snapshot = load_snapshot_from_onedrive()
 
 # Check if data is loaded successfully
-if df.empty:
+if snapshot is None or snapshot['df'].empty:
     st.error("Could not load data. Please check your OneDrive link.")
     st.stop()
 
+# The base frame is shared between sessions - read from it, never modify it
+df = snapshot['df']
+
 # Sidebar filters
 st.sidebar.markdown("## 🔍 Filters")
 st.sidebar.markdown("---")
 
-# Get unique values for filters
-categories = df['Category'].unique() if 'Category' in df.columns else []
-enablement_areas = df['Enablement Area'].unique() if 'Enablement Area' in df.columns else []
-cert_levels = df['Certification Level'].unique() if 'Certification Level' in df.columns else []
-engineers = df['Engineer Name'].unique() if 'Engineer Name' in df.columns else []
+# Option lists come sorted from the snapshot's index - built once per data version, not per rerun
+categories = snapshot['options'].get('Category', [])
+enablement_areas = snapshot['options'].get('Enablement Area', [])
+cert_levels = snapshot['options'].get('Certification Level', [])
+engineers = snapshot['options'].get('Engineer Name', [])
 
 # Multi-select filters
 selected_categories = st.sidebar.multiselect(
     "Sales/Pre-Sales/Post-Sales",
     options=categories,
-    default=categories.tolist() if len(categories) > 0 else []
+    default=categories
 )
 
 selected_areas = st.sidebar.multiselect(
     "Enablement Area",
     options=enablement_areas,
-    default=enablement_areas.tolist() if len(enablement_areas) > 0 else []
+    default=enablement_areas
 )
 
 selected_levels = st.sidebar.multiselect(
     "Certification Level",
     options=cert_levels,
-    default=cert_levels.tolist() if len(cert_levels) > 0 else []
+    default=cert_levels
 )
 
 selected_engineers = st.sidebar.multiselect(
@@ -301,28 +220,23 @@ selected_status = st.sidebar.multiselect(
 )
 
 # Date range filter - FIXED: Removed the format parameter
-if 'Target Date' in df.columns and not df['Target Date'].isna().all():
+if snapshot['date_bounds']:
     st.sidebar.markdown("---")
     st.sidebar.markdown("### 📅 Target Date Range")
     
-    # Get min and max dates
-    valid_dates = df['Target Date'].dropna()
-    if not valid_dates.empty:
-        min_date = valid_dates.min().date()
-        max_date = valid_dates.max().date()
-        
-        # Simple date input without format parameter
-        date_range = st.sidebar.date_input(
-            "Select Range",
-            value=(min_date, max_date),
-            min_value=min_date,
-            max_value=max_date
-        )
-        
-        # Show hint about expected format
-        st.sidebar.caption("Dates are stored in DD/MM/YY format")
-    else:
-        date_range = None
+    # Min and max dates are found once per snapshot
+    min_date, max_date = snapshot['date_bounds']
+    
+    # Simple date input without format parameter
+    date_range = st.sidebar.date_input(
+        "Select Range",
+        value=(min_date, max_date),
+        min_value=min_date,
+        max_value=max_date
+    )
+    
+    # Show hint about expected format
+    st.sidebar.caption("Dates are stored in DD/MM/YY format")
 else:
     date_range = None
 
@@ -331,496 +245,220 @@ st.sidebar.markdown("---")
 if st.sidebar.button("🔄 Manual Refresh Now"):
     st.rerun()
 
-# Apply filters
-filtered_df = df.copy()
-
-if selected_categories and 'Category' in df.columns:
-    filtered_df = filtered_df[filtered_df['Category'].isin(selected_categories)]
-
-if selected_areas and 'Enablement Area' in df.columns:
-    filtered_df = filtered_df[filtered_df['Enablement Area'].isin(selected_areas)]
-
-if selected_levels and 'Certification Level' in df.columns:
-    filtered_df = filtered_df[filtered_df['Certification Level'].isin(selected_levels)]
-
-if selected_engineers and 'Engineer Name' in df.columns:
-    filtered_df = filtered_df[filtered_df['Engineer Name'].isin(selected_engineers)]
-
-if 'Status' in filtered_df.columns:
-    filtered_df = filtered_df[filtered_df['Status'].isin(selected_status)]
-
-if date_range and len(date_range) == 2 and 'Target Date' in filtered_df.columns:
-    start_date, end_date = date_range
-    # Convert to datetime for comparison
-    start_datetime = pd.Timestamp(start_date)
-    end_datetime = pd.Timestamp(end_date) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)  # End of day
-    
-    filtered_df = filtered_df[
-        (filtered_df['Target Date'] >= start_datetime) &
-        (filtered_df['Target Date'] <= end_datetime)
-    ]
+# Apply filters - on cube cells, then resolved to row positions for the row-level sections
+cube = snapshot['cube']
+filters = {
+    'Category': selected_categories,
+    'Enablement Area': selected_areas,
+    'Certification Level': selected_levels,
+    'Engineer Name': selected_engineers,
+    'Status': selected_status,
+    'Target Date': date_range
+}
+cells = select_cells(cube, filters)
+positions = cube_positions(cube, cells)
 
 # Main dashboard
 st.markdown('<p class="main-header">🎯 VMware Certification Dashboard 2026</p>', unsafe_allow_html=True)
 st.markdown("### VMware Certification Status")
 
-# Top KPI metrics - All 8 columns with equal width and increased uniform height
-col1, col2, col3, col4, col5, col6, col7, col8 = st.columns(8)
-
-with col1:
-    st.markdown("""
-        <div class="metric-card">
-            <h4>Resources</h4>
-            <h2>{}</h2>
-        </div>
-    """.format(filtered_df['Engineer Name'].nunique() if 'Engineer Name' in filtered_df.columns else 0), unsafe_allow_html=True)
-
-with col2:
-    st.markdown("""
-        <div class="metric-card">
-            <h4>Total Certs</h4>
-            <h2>{}</h2>
-        </div>
-    """.format(len(filtered_df)), unsafe_allow_html=True)
-
-with col3:
-    sales_count = len(filtered_df[filtered_df['Category'] == 'Sales']) if 'Category' in filtered_df.columns else 0
-    st.markdown("""
-        <div class="metric-card">
-            <h4>Sales</h4>
-            <h2>{}</h2>
-        </div>
-    """.format(sales_count), unsafe_allow_html=True)
-
-with col4:
-    pre_sales_count = len(filtered_df[filtered_df['Category'] == 'Pre-Sales']) if 'Category' in filtered_df.columns else 0
-    st.markdown("""
-        <div class="metric-card">
-            <h4>Pre-Sales</h4>
-            <h2>{}</h2>
-        </div>
-    """.format(pre_sales_count), unsafe_allow_html=True)
-
-with col5:
-    post_sales_count = len(filtered_df[filtered_df['Category'] == 'Post-Sales']) if 'Category' in filtered_df.columns else 0
-    st.markdown("""
-        <div class="metric-card">
-            <h4>Post-Sales</h4>
-            <h2>{}</h2>
-        </div>
-    """.format(post_sales_count), unsafe_allow_html=True)
-
-with col6:
-    completed_count = len(filtered_df[filtered_df['Status'] == 'Completed']) if 'Status' in filtered_df.columns else 0
-    st.markdown("""
-        <div class="metric-card" style="background: linear-gradient(135deg, #10B981 0%, #059669 100%); height: 160px;">
-            <h4>Completed</h4>
-            <h2>{}</h2>
-        </div>
-    """.format(completed_count), unsafe_allow_html=True)
-
-with col7:
-    in_progress_count = len(filtered_df[filtered_df['Status'] == 'In Progress']) if 'Status' in filtered_df.columns else 0
-    st.markdown("""
-        <div class="metric-card" style="background: linear-gradient(135deg, #FFFF00 0%, #FDE68A 100%); height: 160px; color: #92400E;">
-            <h4 style="color: #92400E;">In Progress</h4>
-            <h2 style="color: #92400E;">{}</h2>
-        </div>
-    """.format(in_progress_count), unsafe_allow_html=True)
-
-with col8:
-    not_started_count = len(filtered_df[filtered_df['Status'] == 'Not Started']) if 'Status' in filtered_df.columns else 0
-    st.markdown("""
-        <div class="metric-card" style="background: linear-gradient(135deg, #EF4444 0%, #DC2626 100%); height: 160px;">
-            <h4>Not Started</h4>
-            <h2>{}</h2>
-        </div>
-    """.format(not_started_count), unsafe_allow_html=True)
-
-st.markdown("---")
-
-# Charts section with professional styling
-col1, col2 = st.columns(2)
-
-with col1:
-    st.markdown('<p class="sub-header">📊 Certifications by Category</p>', unsafe_allow_html=True)
-    if 'Category' in filtered_df.columns:
-        category_counts = filtered_df['Category'].value_counts().reset_index()
-        category_counts.columns = ['Category', 'Count']
-        
-        # Professional color palette for categories
-        colors = {'Sales': '#2E4057',      # Dark blue-gray
-                 'Pre-Sales': '#4A6FA5',   # Muted blue
-                 'Post-Sales': '#6B4E71'}   # Muted purple
-        
-        # Create donut chart for more modern look
-        fig = px.pie(category_counts, values='Count', names='Category', 
-                     title='Distribution by Category',
-                     color='Category', 
-                     color_discrete_map=colors,
-                     hole=0.4)  # Creates donut chart
-        
-        # Update layout for professional appearance
-        fig.update_traces(
-            textposition='inside', 
-            textinfo='percent+label',
-            textfont=dict(size=12, color='white'),
-            marker=dict(line=dict(color='white', width=2)),
-            hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-        )
-        
-        fig.update_layout(
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=-0.2,
-                xanchor="center",
-                x=0.5,
-                font=dict(size=11)
-            ),
-            margin=dict(t=50, b=50, l=20, r=20),
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            title=dict(
-                text="Distribution by Category",
-                font=dict(size=16, color='#1E3A8A'),
-                x=0.5,
-                xanchor='center'
-            )
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+# Saved presets are pre-rendered by reports.py - link to the static report when this view is one of them.
+# Only a link is sent (a report inlines plotly.js and is several MB), so this needs the URL the reports are served from.
+reports_url = os.environ.get('VMWARE_DASHBOARD_REPORTS_URL')
+report = match_preset(load_manifest(), snapshot, filters) if reports_url else None
+if report and os.path.isfile(os.path.join(REPORTS_DIR, report['file'])):
+    st.info(f"📄 This view matches the saved report **{report['name']}**, already rendered for the current data.")
+    st.link_button("Open prebuilt report", f"{reports_url.rstrip('/')}/{report['file']}")
+
+# Each section below is a fragment with declared inputs. A filter change still runs the page,
+# but a section whose inputs didn't change reuses its last output instead of rebuilding it.
+st.session_state['full_rerun'] = True
+
+@dashboard_fragment
+def kpi_row(cells):
+    """Top KPI metrics - All 8 columns with equal width and increased uniform height"""
+    kpis = cached_section('kpi_row', [snapshot['version'], cells], lambda: compute_kpis(cube, cells))
+    
+    for col, (title, key, card_style, text_style) in zip(st.columns(8), KPI_CARDS):
+        with col:
+            st.markdown(build_kpi_card_html(title, kpis[key], card_style, text_style), unsafe_allow_html=True)
+
+@dashboard_fragment
+def charts(cells):
+    """Charts section with professional styling - inputs are the cube totals each chart plots"""
+    version = snapshot['version']
+    
+    # First row
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown('<p class="sub-header">📊 Certifications by Category</p>', unsafe_allow_html=True)
+        if 'Category' in cube['dimensions']:
+            category_totals = cube_counts(cube, cells, ['Category'])
+            if COMPACT_MODE:
+                category_totals = collapse_tail(category_totals, snapshot['ranked']['Category'], CHART_TOP_N)
+            fig = cached_section('category_pie', [version, category_totals], lambda: build_category_pie(category_totals))
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("Category data not available")
+    
+    with col2:
+        st.markdown('<p class="sub-header">📈 Status Distribution</p>', unsafe_allow_html=True)
+        if 'Status' in cube['dimensions']:
+            status_totals = cube_counts(cube, cells, ['Status'])
+            fig = cached_section('status_pie', [version, status_totals], lambda: build_status_pie(status_totals))
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("Status data not available")
+    
+    # Second row
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown('<p class="sub-header">📊 Enablement Areas</p>', unsafe_allow_html=True)
+        if 'Enablement Area' in cube['dimensions']:
+            area_totals = cube_counts(cube, cells, ['Enablement Area'])
+            if COMPACT_MODE:
+                # The long tail becomes one "Other" bar - the largest bars of this view are always kept
+                area_totals = collapse_tail(area_totals, snapshot['ranked']['Enablement Area'], CHART_TOP_N)
+            fig = cached_section('area_bar', [version, area_totals], lambda: build_area_bar(area_totals))
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("Enablement Area data not available")
+    
+    with col2:
+        st.markdown('<p class="sub-header">📊 Category-wise Status</p>', unsafe_allow_html=True)
+        if 'Category' in cube['dimensions'] and 'Status' in cube['dimensions']:
+            # Same shape as pd.crosstab: categories down, statuses across, both sorted
+            category_status = cube_counts(cube, cells, ['Category', 'Status']).unstack(fill_value=0).sort_index().sort_index(axis=1)
+            fig = cached_section('category_status_bar', [version, category_status], lambda: build_category_status_bar(category_status))
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("Category or Status data not available")
+
+@dashboard_fragment
+def timeline(cells):
+    """Certification timeline - input is the per-day, per-status counts"""
+    st.markdown('<p class="sub-header">📅 Certification Timeline</p>', unsafe_allow_html=True)
+    if 'Target Date' in cube['dimensions']:
+        # The cube already buckets by day; undated cells are dropped by the grouping
+        timeline_counts = cube_counts(cube, cells, ['Target Date', 'Status'])
+        
+        if not timeline_counts.empty:
+            fig = cached_section('timeline', [snapshot['version'], timeline_counts], lambda: build_timeline(timeline_counts))
+            if COMPACT_MODE:
+                # Too many days to send: merge them into weeks, then months, until the chart fits the budget
+                name, grouped_by = 'timeline', None
+                for freq, period in (('W', 'week'), ('M', 'month')):
+                    if st.session_state['section_cache'][name].payload <= ELEMENT_BUDGET:
+                        break
+                    # The finer chart is not sent, so it does not count towards this rerun's payload
+                    st.session_state['section_stats']['payload'].pop(name, None)
+                    name, grouped_by = f'timeline_{period}ly', period
+                    timeline_counts = coarsen_timeline(timeline_counts, freq)
+                    fig = cached_section(name, [snapshot['version'], timeline_counts], lambda: build_timeline(timeline_counts))
+                if grouped_by:
+                    st.caption(f"Too many dates to chart day by day - bars are grouped by {grouped_by}")
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No valid Target Date data available")
     else:
-        st.info("Category data not available")
+        st.info("Target Date data not available")
 
-with col2:
-    st.markdown('<p class="sub-header">📈 Status Distribution</p>', unsafe_allow_html=True)
-    if 'Status' in filtered_df.columns:
-        status_counts = filtered_df['Status'].value_counts().reset_index()
-        status_counts.columns = ['Status', 'Count']
-        
-        # Professional color palette for status
-        colors = {'Completed': '#2E7D32',      # Dark green
-                 'In Progress': "#F1CF37",      # Warm amber
-                 'Not Started': '#D32F2F'}      # Dark red
-        
-        # Create donut chart for more modern look
-        fig = px.pie(status_counts, values='Count', names='Status', 
-                     title='Overall Status Distribution',
-                     color='Status', 
-                     color_discrete_map=colors,
-                     hole=0.4)  # Creates donut chart
-        
-        # Update layout for professional appearance
-        fig.update_traces(
-            textposition='inside', 
-            textinfo='percent+label',
-            textfont=dict(size=12, color='white'),
-            marker=dict(line=dict(color='white', width=2)),
-            hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
+@dashboard_fragment
+def detail_grid(positions):
+    """Detailed table - input is the selected rows"""
+    st.markdown('<p class="sub-header">📋 Detailed Certification Plan</p>', unsafe_allow_html=True)
+    
+    display_columns = ['Category', 'Enablement Area', 'Certification Level', 'Engineer Name', 
+                       'Assigned Certification', 'Target Date', 'Completion Date','Status', 'Remarks']
+    available_columns = [col for col in display_columns if col in df.columns]
+    
+    if available_columns:
+        def build():
+            # Date columns come preformatted from the snapshot
+            display_df = select_columns(snapshot, positions, available_columns, formatted=True)
+            
+            # Status badges are built once per snapshot - a Styler would restyle every cell on every rerun
+            if 'Status' in display_df.columns:
+                display_df['Status'] = snapshot['status_badges'].iloc[positions]
+            return fit_rows(display_df)
+        
+        grid_df = cached_section('detail_grid', [snapshot['version'], positions], build)
+        st.dataframe(
+            grid_df,
+            width='stretch',
+            height=500
         )
-        
-        fig.update_layout(
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=-0.2,
-                xanchor="center",
-                x=0.5,
-                font=dict(size=11)
-            ),
-            margin=dict(t=50, b=50, l=20, r=20),
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            title=dict(
-                text="Overall Status Distribution",
-                font=dict(size=16, color='#1E3A8A'),
-                x=0.5,
-                xanchor='center'
+        if len(grid_df) < len(positions):
+            st.caption(f"Showing the first {len(grid_df):,} of {len(positions):,} rows - download the CSV below for all of them")
+
+@dashboard_fragment
+def export(positions):
+    """Export - input is the selected rows"""
+    st.markdown("---")
+    col1, col2 = st.columns(2)
+    with col1:
+        if len(positions) > 0:
+            # Export data with dates as strings to avoid conversion issues
+            csv = cached_section(
+                'export', [snapshot['version'], positions],
+                # Bytes, not text: a download is served by URL and doesn't count against the page budget
+                lambda: select_columns(snapshot, positions, df.columns, formatted=True).to_csv(index=False).encode('utf-8')
             )
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("Status data not available")
-
-# Second row
-col1, col2 = st.columns(2)
-
-with col1:
-    st.markdown('<p class="sub-header">📊 Enablement Areas</p>', unsafe_allow_html=True)
-    if 'Enablement Area' in filtered_df.columns:
-        area_counts = filtered_df['Enablement Area'].value_counts().reset_index()
-        area_counts.columns = ['Enablement Area', 'Count']
-        
-        # Professional bar chart styling
-        custom_blues = ['#1E3A8A', '#2563EB', '#3B82F6', '#60A5FA', '#93C5FD', '#BFDBFE']
-        fig = px.bar(area_counts, x='Enablement Area', y='Count', 
-             color='Enablement Area',
-             color_discrete_sequence=custom_blues,
-             title='Certifications by Area')
-        
-        fig.update_layout(
-            xaxis_title="Enablement Area",
-            yaxis_title="Number of Certifications",
-            showlegend=False,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            title=dict(
-                text="Certifications by Area",
-                font=dict(size=16, color='#1E3A8A'),
-                x=0.5,
-                xanchor='center'
+            st.download_button(
+                label="📥 Download Filtered Data (CSV)",
+                data=csv,
+                file_name=f"vmware_certifications_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
             )
-        )
-        
-        fig.update_traces(
-            marker_line_color='white',
-            marker_line_width=1,
-            opacity=0.8,
-            hovertemplate='<b>%{x}</b><br>Count: %{y}<extra></extra>'
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("Enablement Area data not available")
 
-with col2:
-    st.markdown('<p class="sub-header">📊 Category-wise Status</p>', unsafe_allow_html=True)
-    if 'Category' in filtered_df.columns and 'Status' in filtered_df.columns:
-        category_status = pd.crosstab(filtered_df['Category'], filtered_df['Status'])
-        
-        # Professional color palette for status
-        status_colors = {'Completed': '#2E7D32', 'In Progress': "#F1CF37", 'Not Started': '#D32F2F'}
-        
-        fig = px.bar(category_status, barmode='stack', 
-                     title='Status Distribution by Category',
-                     color_discrete_map=status_colors)
-        
-        fig.update_layout(
-            xaxis_title="Category",
-            yaxis_title="Number of Certifications",
-            legend_title="Status",
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            title=dict(
-                text="Status Distribution by Category",
-                font=dict(size=16, color='#1E3A8A'),
-                x=0.5,
-                xanchor='center'
-            ),
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="center",
-                x=0.5
-            )
-        )
-        
-        fig.update_traces(
-            marker_line_color='white',
-            marker_line_width=1,
-            opacity=0.8,
-            hovertemplate='<b>%{x}</b><br>Status: %{legend}<br>Count: %{y}<extra></extra>'
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("Category or Status data not available")
-
-# Timeline
-st.markdown('<p class="sub-header">📅 Certification Timeline</p>', unsafe_allow_html=True)
-if 'Target Date' in filtered_df.columns and not filtered_df['Target Date'].isna().all():
-    # Ensure Target Date is datetime for grouping
-    filtered_df_timeline = filtered_df.copy()
-    filtered_df_timeline['Target Date'] = pd.to_datetime(filtered_df_timeline['Target Date'], errors='coerce')
-    filtered_df_timeline = filtered_df_timeline.dropna(subset=['Target Date'])
-    
-    if not filtered_df_timeline.empty:
-        timeline_data = filtered_df_timeline.groupby([filtered_df_timeline['Target Date'].dt.date, 'Status']).size().reset_index()
-        timeline_data.columns = ['Target Date', 'Status', 'Count']
-        
-        # Professional color palette for status
-        status_colors = {'Completed': '#2E7D32', 'In Progress': "#F1CF37", 'Not Started': '#D32F2F'}
-        
-        fig = px.bar(timeline_data, x='Target Date', y='Count', color='Status',
-                      title='Certifications by Target Date',
-                      color_discrete_map=status_colors)
-        
-        fig.update_layout(
-            xaxis_title="Target Date",
-            yaxis_title="Number of Certifications",
-            legend_title="Status",
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            title=dict(
-                text="Certifications by Target Date",
-                font=dict(size=16, color='#1E3A8A'),
-                x=0.5,
-                xanchor='center'
-            ),
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="center",
-                x=0.5
+@dashboard_fragment
+def engineer_summary(positions):
+    """Engineer Summary - input is the selected rows"""
+    st.markdown('<p class="sub-header">👥 Engineer Summary</p>', unsafe_allow_html=True)
+    if 'Engineer Name' in df.columns and len(positions) > 0:
+        html_table = cached_section(
+            'engineer_summary', [snapshot['version'], positions],
+            lambda: build_engineer_summary_html(
+                select_columns(snapshot, positions, ['Engineer Name', 'Category', 'Assigned Certification', 'Status']),
+                max_bytes=ELEMENT_BUDGET if COMPACT_MODE else None
             )
         )
         
-        fig.update_traces(
-            marker_line_color='white',
-            marker_line_width=1,
-            opacity=0.8,
-            hovertemplate='<b>%{x}</b><br>Status: %{legend}<br>Count: %{y}<extra></extra>'
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("No valid Target Date data available")
-else:
-    st.info("Target Date data not available")
-
-# Detailed table
-st.markdown('<p class="sub-header">📋 Detailed Certification Plan</p>', unsafe_allow_html=True)
-
-display_columns = ['Category', 'Enablement Area', 'Certification Level', 'Engineer Name', 
-                   'Assigned Certification', 'Target Date', 'Completion Date','Status', 'Remarks']
-available_columns = [col for col in display_columns if col in filtered_df.columns]
+        # Display the HTML table
+        st.markdown(html_table, unsafe_allow_html=True)
 
-if available_columns:
-    display_df = filtered_df[available_columns].copy()
-    
-    # Use the new function to prepare all date columns for display
-    display_df = prepare_dates_for_display(display_df)
-    
-    def color_status(val):
-        if val == 'Completed':
-            return 'background-color: #E8F5E9; color: #2E7D32'
-        elif val == 'In Progress':
-            return 'background-color: #FFF3E0; color: #FDB750'
+@dashboard_fragment
+def upcoming_deadlines(positions):
+    """Upcoming deadlines - read from the digest engine's deadline queue, narrowed to the selected rows"""
+    st.markdown('<p class="sub-header">⏰ Upcoming Deadlines (Next 7 Days)</p>', unsafe_allow_html=True)
+    if 'Target Date' in snapshot['df'].columns and 'Status' in snapshot['df'].columns:
+        # The queue only holds unfinished, dated rows and is updated once per data version and day
+        upcoming = np.intersect1d(get_live_engine(snapshot).window_positions('Next 7 days'), positions, assume_unique=True)
+        
+        if len(upcoming) > 0:
+            # Only the matching rows are read, with dates preformatted
+            html_table = cached_section(
+                'upcoming_deadlines', [snapshot['version'], upcoming],
+                lambda: build_deadlines_html(select_columns(
+                    snapshot, upcoming,
+                    ['Engineer Name', 'Category', 'Enablement Area', 'Assigned Certification', 'Target Date', 'Status'],
+                    formatted=True
+                ), max_bytes=ELEMENT_BUDGET if COMPACT_MODE else None)
+            )
+            st.markdown(html_table, unsafe_allow_html=True)
         else:
-            return 'background-color: #FFEBEE; color: #D32F2F'
-    
-    st.dataframe(
-        display_df.style.map(color_status, subset=['Status']),
-        width='stretch',
-        height=500
-    )
+            st.info("No upcoming deadlines in the next 7 days")
 
-# Export
+kpi_row(cells)
 st.markdown("---")
-col1, col2 = st.columns(2)
-with col1:
-    if not filtered_df.empty:
-        # Prepare export data with dates as strings to avoid conversion issues
-        export_df = prepare_dates_for_display(filtered_df)
-        csv = export_df.to_csv(index=False)
-        st.download_button(
-            label="📥 Download Filtered Data (CSV)",
-            data=csv,
-            file_name=f"vmware_certifications_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv"
-        )
-
-# Engineer Summary - HTML TABLE APPROACH FOR CENTER ALIGNMENT
-st.markdown('<p class="sub-header">👥 Engineer Summary</p>', unsafe_allow_html=True)
-if 'Engineer Name' in filtered_df.columns:
-    engineer_summary = filtered_df.groupby('Engineer Name').agg({
-        'Category': lambda x: ', '.join(x.unique()) if 'Category' in filtered_df.columns else 'N/A',
-        'Assigned Certification': 'count' if 'Assigned Certification' in filtered_df.columns else 'size',
-        'Status': [
-            ('Completed', lambda x: (x == 'Completed').sum()),
-            ('In Progress', lambda x: (x == 'In Progress').sum()),
-            ('Not Started', lambda x: (x == 'Not Started').sum())
-        ]
-    }).reset_index()
-    
-    engineer_summary.columns = ['Engineer Name', 'Categories', 'Total Certs', 'Completed', 'In Progress', 'Not Started']
-    engineer_summary['Completion Rate'] = (engineer_summary['Completed'] / engineer_summary['Total Certs'] * 100).round(1)
-    
-    # Format the Completion Rate column
-    engineer_summary['Completion Rate'] = engineer_summary['Completion Rate'].astype(str) + '%'
-    
-    # Convert to HTML table with inline styles for center alignment
-    html_table = "<div style='overflow-x: auto;'><table style='width:100%; border-collapse: collapse; margin: 10px 0; font-size: 14px; font-family: sans-serif; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>"
-    
-    # Add headers
-    html_table += "<thead><tr style='background-color: #1E3A8A; color: white;'>"
-    for col in engineer_summary.columns:
-        html_table += f"<th style='text-align: center; padding: 12px; border: 1px solid #dee2e6; font-weight: bold;'>{col}</th>"
-    html_table += "</tr></thead><tbody>"
-    
-    # Add data rows with alternating colors
-    for i, (_, row) in enumerate(engineer_summary.iterrows()):
-        bg_color = '#f8f9fa' if i % 2 == 0 else 'white'
-        html_table += f"<tr style='background-color: {bg_color};'>"
-        for col in engineer_summary.columns:
-            html_table += f"<td style='text-align: center; padding: 10px; border: 1px solid #dee2e6;'>{row[col]}</td>"
-        html_table += "</tr>"
-    
-    html_table += "</tbody></table></div>"
-    
-    # Add some CSS for hover effect
-    html_table += """
-    <style>
-        table tr:hover {
-            background-color: #e9ecef !important;
-        }
-        table tr:hover td {
-            background-color: #e9ecef !important;
-        }
-    </style>
-    """
-    
-    # Display the HTML table
-    st.markdown(html_table, unsafe_allow_html=True)
-
-# Upcoming deadlines
-st.markdown('<p class="sub-header">⏰ Upcoming Deadlines (Next 7 Days)</p>', unsafe_allow_html=True)
-if 'Target Date' in filtered_df.columns and 'Status' in filtered_df.columns:
-    # Ensure Target Date is datetime for filtering
-    filtered_df_filter = filtered_df.copy()
-    filtered_df_filter['Target Date'] = pd.to_datetime(filtered_df_filter['Target Date'], errors='coerce')
-    
-    today = pd.Timestamp.now().normalize()
-    next_week = today + pd.Timedelta(days=7)
-    
-    upcoming = filtered_df_filter[
-        (filtered_df_filter['Target Date'] >= today) & 
-        (filtered_df_filter['Target Date'] <= next_week) &
-        (filtered_df_filter['Status'] != 'Completed')
-    ].copy()
-    
-    if not upcoming.empty:
-        # Prepare for display using the helper function
-        upcoming_display = upcoming[['Engineer Name', 'Category', 'Enablement Area', 'Assigned Certification', 'Target Date', 'Status']].copy()
-        upcoming_display = prepare_dates_for_display(upcoming_display)
-        
-        # Convert to HTML table for center alignment
-        html_table = "<div style='overflow-x: auto;'><table style='width:100%; border-collapse: collapse; margin: 10px 0; font-size: 14px; font-family: sans-serif;'>"
-        
-        # Add headers
-        html_table += "<thead><tr style='background-color: #f0f2f6; font-weight: bold;'>"
-        for col in upcoming_display.columns:
-            html_table += f"<th style='text-align: center; padding: 10px; border: 1px solid #dee2e6;'>{col}</th>"
-        html_table += "</tr></thead><tbody>"
-        
-        # Add data rows
-        for _, row in upcoming_display.iterrows():
-            html_table += "<tr>"
-            for col in upcoming_display.columns:
-                html_table += f"<td style='text-align: center; padding: 8px; border: 1px solid #dee2e6;'>{row[col]}</td>"
-            html_table += "</tr>"
-        
-        html_table += "</tbody></table></div>"
-        
-        st.markdown(html_table, unsafe_allow_html=True)
-    else:
-        st.info("No upcoming deadlines in the next 7 days")
+charts(cells)
+timeline(cells)
+detail_grid(positions)
+export(positions)
+engineer_summary(positions)
+upcoming_deadlines(positions)
 
 # Footer
 st.markdown("---")
@@ -834,3 +472,7 @@ st.markdown("""
     datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
     REFRESH_INTERVAL//60
 ), unsafe_allow_html=True)
+
+# Log what this rerun rebuilt versus reused
+log_section_savings()
+st.session_state['full_rerun'] = False
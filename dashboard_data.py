@@ -0,0 +1,836 @@
+"""Data loading and aggregation shared by the dashboard (app3.py) and the report builder (reports.py).
+
+Nothing here touches Streamlit, so it can run headless. Anything that would warn the viewer
+takes a `warn` callable instead.
+"""
+import hashlib
+import os
+import re
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import requests
+
+# Your OneDrive sharing link (VMWARE_DASHBOARD_SOURCE points it elsewhere, e.g. a load test stand-in)
+SHARE_LINK = "https://jafferbrothers-my.sharepoint.com/:x:/g/personal/customercare_jbs_live/IQAb-s-HyehHTabXHhqu0FTWAVKn9D-CnZ0YH5kw1BZDOGA?e=0RVyMd"
+
+# Schema configuration - canonical headers and the values each dimension may take
+KNOWN_COLUMNS = ['Category', 'Enablement Area', 'Certification Level', 'Engineer Name',
+                 'Assigned Certification', 'Target Date', 'Completion Date', 'Status', 'Remarks']
+DATE_COLUMNS = ['Target Date', 'Completion Date']
+DATE_FORMATS = ['%d/%m/%y', '%d/%m/%Y', '%d-%m-%y', '%d-%m-%Y', '%Y-%m-%d']
+STATUS_VALUES = ['Not Started', 'In Progress', 'Completed']
+# Dimensions the count cube is keyed by - every KPI and chart is a count over these
+CUBE_DIMENSIONS = ['Category', 'Enablement Area', 'Certification Level', 'Engineer Name', 'Status', 'Target Date']
+STATUS_BADGES = {'Completed': '🟢 Completed', 'In Progress': '🟡 In Progress', 'Not Started': '🔴 Not Started'}
+DIMENSION_VOCABULARIES = {
+    'Category': ['Sales', 'Pre-Sales', 'Post-Sales'],
+    'Enablement Area': None,
+    'Certification Level': None,
+    'Engineer Name': None,
+    'Status': STATUS_VALUES
+}
+
+# Filters offered in the sidebar, in display order
+FILTER_DIMENSIONS = ['Category', 'Enablement Area', 'Certification Level', 'Engineer Name', 'Status']
+
+# KPI cards: title, key into compute_kpis(), extra card style, extra text style
+KPI_CARDS = [
+    ('Resources', 'resources', '', ''),
+    ('Total Certs', 'total', '', ''),
+    ('Sales', 'sales', '', ''),
+    ('Pre-Sales', 'pre_sales', '', ''),
+    ('Post-Sales', 'post_sales', '', ''),
+    ('Completed', 'completed', 'background: linear-gradient(135deg, #10B981 0%, #059669 100%); height: 160px;', ''),
+    ('In Progress', 'in_progress', 'background: linear-gradient(135deg, #FFFF00 0%, #FDE68A 100%); height: 160px; color: #92400E;', 'color: #92400E;'),
+    ('Not Started', 'not_started', 'background: linear-gradient(135deg, #EF4444 0%, #DC2626 100%); height: 160px;', '')
+]
+
+# Custom CSS for professional look - Updated for taller uniform box heights
+DASHBOARD_CSS = """
+    <style>
+    .main-header {
+        font-size: 2.5rem;
+        color: #1E3A8A;
+        font-weight: 600;
+        margin-bottom: 1rem;
+    }
+    .sub-header {
+        font-size: 1.5rem;
+        color: #2563EB;
+        font-weight: 500;
+    }
+    .metric-card {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 1.5rem;
+        border-radius: 10px;
+        color: white;
+        text-align: center;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+        height: 160px;
+        display: flex;
+        flex-direction: column;
+        justify-content: center;
+        align-items: center;
+        margin-bottom: 1rem;
+    }
+    .metric-card h4 {
+        margin: 0;
+        font-size: 1rem;
+        font-weight: 400;
+        opacity: 0.9;
+    }
+    .metric-card h2 {
+        margin: 0.7rem 0 0 0;
+        font-size: 2.5rem;
+        font-weight: 700;
+    }
+    .refresh-badge {
+        position: fixed;
+        top: 10px;
+        right: 10px;
+        background-color: #10B981;
+        color: white;
+        padding: 5px 15px;
+        border-radius: 20px;
+        font-size: 12px;
+        z-index: 999;
+        box-shadow: 0 2px 5px rgba(0,0,0,0.2);
+    }
+    .status-completed {
+        background-color: #10B981;
+        color: white;
+        padding: 0.25rem 0.75rem;
+        border-radius: 20px;
+        font-size: 0.85rem;
+        font-weight: 500;
+    }
+    .status-progress {
+        background-color: #FEF3C7;
+        color: #92400E;
+        padding: 0.25rem 0.75rem;
+        border-radius: 20px;
+        font-size: 0.85rem;
+        font-weight: 500;
+    }
+    .status-notstarted {
+        background-color: #EF4444;
+        color: white;
+        padding: 0.25rem 0.75rem;
+        border-radius: 20px;
+        font-size: 0.85rem;
+        font-weight: 500;
+    }
+    div[data-testid="column"] {
+        display: flex;
+        flex-direction: column;
+    }
+    .chart-container {
+        background-color: white;
+        border-radius: 10px;
+        padding: 1rem;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.05);
+        margin-bottom: 1rem;
+    }
+    </style>
+"""
+
+# Compiled normalization plans keyed by header signature, and the latest snapshot -
+# module level, so they are shared by every rerun and session in the process
+_normalization_plans = {}
+_snapshots = {}
+
+def fetch_workbook():
+    """Download the dashboard workbook and return its bytes"""
+    share_link = os.environ.get('VMWARE_DASHBOARD_SOURCE', SHARE_LINK)
+    
+    # Get direct download link
+    direct_link = get_direct_link(share_link)
+    
+    # Add headers to mimic a browser request
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    }
+    
+    # Download the file
+    response = requests.get(direct_link, headers=headers, timeout=30)
+    response.raise_for_status()
+    return response.content
+
+# OneDrive direct download link function
+def get_direct_link(share_link):
+    """Convert OneDrive sharing link to direct download link"""
+    try:
+        base_url = share_link.split('?')[0]
+        if '/personal/' in base_url:
+            return base_url + '?download=1'
+        else:
+            return base_url.replace('sharepoint.com/:x:', 'sharepoint.com/:x:/') + '?download=1'
+    except Exception:
+        # Fall back to the sharing link as given
+        return share_link
+
+def parse_dates(date_str):
+    """Parse dates in DD/MM/YY format"""
+    if pd.isna(date_str) or date_str == '':
+        return pd.NaT
+    
+    try:
+        # Try parsing as DD/MM/YY
+        if isinstance(date_str, str):
+            # Remove any extra spaces
+            date_str = date_str.strip()
+            
+            # Try different date formats
+            for fmt in DATE_FORMATS:
+                try:
+                    return pd.to_datetime(date_str, format=fmt)
+                except:
+                    continue
+            
+            # If specific formats fail, let pandas guess with dayfirst=True
+            return pd.to_datetime(date_str, dayfirst=True)
+        else:
+            # If it's already a datetime or timestamp
+            return pd.to_datetime(date_str)
+    except:
+        return pd.NaT
+
+def normalize_key(value):
+    """Case- and whitespace-insensitive lookup key for headers and values"""
+    return ' '.join(str(value).split()).casefold()
+
+def slugify(name):
+    """File-name-safe form of a preset, engineer or category name"""
+    return re.sub(r'[^a-z0-9]+', '-', str(name).lower()).strip('-') or 'unnamed'
+
+def header_signature(columns):
+    """Hash the raw header row so identical sheets share one normalization plan"""
+    return hashlib.sha1('\x1f'.join(str(col) for col in columns).encode('utf-8')).hexdigest()
+
+def compile_normalization_plan(columns):
+    """Compile column renames, dtypes and canonical value maps for a header row"""
+    known = {normalize_key(col): col for col in KNOWN_COLUMNS}
+    renames = {}
+    taken = set()
+    unknown = []
+    
+    for i, raw_col in enumerate(columns):
+        key = normalize_key(raw_col)
+        target = None
+        if i == 0 and 'sales / pre-sales / post-sales' in key:
+            target = 'Category'
+        elif key in known:
+            target = known[key]
+        elif 'status' in key:
+            target = 'Status'
+        
+        # Keep the first header claiming a canonical name, report the rest under a name no other column has
+        if target is None or target in taken:
+            name = str(raw_col).strip()
+            target = name
+            suffix = 2
+            while target in taken:
+                target = f"{name} ({suffix})"
+                suffix += 1
+            unknown.append(target)
+        renames[raw_col] = target
+        taken.add(target)
+    
+    present = set(renames.values())
+    value_maps = {}
+    for col, vocabulary in DIMENSION_VOCABULARIES.items():
+        if col in present:
+            value_maps[col] = {normalize_key(v): v for v in vocabulary} if vocabulary else None
+    
+    return {
+        'signature': header_signature(columns),
+        'renames': renames,
+        'date_columns': [col for col in DATE_COLUMNS if col in present],
+        'value_maps': value_maps,
+        'unknown_columns': unknown,
+        'reported_values': set()
+    }
+
+def get_normalization_plan(columns, warn=None):
+    """Return the cached plan for this header row, compiling it (and reporting unknown headers) on first sight"""
+    signature = header_signature(columns)
+    plan = _normalization_plans.get(signature)
+    if plan is None:
+        plan = compile_normalization_plan(columns)
+        _normalization_plans[signature] = plan
+        if plan['unknown_columns'] and warn:
+            warn(f"⚠️ Unrecognised columns kept as-is: {', '.join(plan['unknown_columns'])}")
+    return plan
+
+def parse_date_column(series):
+    """Vectorized parse_dates - tries each DD/MM/YY format over the whole column"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    
+    result = pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]')
+    is_text = np.fromiter((isinstance(v, str) for v in series), dtype=bool, count=len(series))
+    
+    # Cells Excel already typed as dates
+    native = series[~is_text & series.notna().to_numpy()]
+    if not native.empty:
+        result[native.index] = pd.to_datetime(native, errors='coerce')
+    
+    # astype(str) keeps .str usable when the column holds no text at all (all blank or all numeric)
+    text = series[is_text].astype(str).str.strip()
+    text = text[text != '']
+    for fmt in DATE_FORMATS:
+        if text.empty:
+            break
+        parsed = pd.to_datetime(text, format=fmt, errors='coerce')
+        matched = parsed.notna()
+        result[parsed.index[matched]] = parsed[matched]
+        text = text[~matched]
+    
+    # Let pandas guess whatever is left, as parse_dates does
+    if not text.empty:
+        result[text.index] = text.map(parse_dates)
+    
+    return result
+
+def canonicalize_column(series, value_map, plan, col, warn=None):
+    """Map every spelling of a value onto one canonical label in a single pass"""
+    codes, uniques = pd.factorize(series)
+    is_text = [isinstance(v, str) for v in uniques]
+    if not any(is_text):
+        # Numbers, dates and the like have one spelling already - leave the column exactly as read
+        return series
+    
+    # Only text is stripped and matched case-insensitively; anything else passes through unchanged
+    labels = np.array([v.strip() if text else v for v, text in zip(uniques, is_text)], dtype=object)
+    keys = [normalize_key(v) if text else v for v, text in zip(labels, is_text)]
+    
+    if value_map is not None:
+        canonical = np.array([value_map.get(k, label) for k, label in zip(keys, labels)], dtype=object)
+        unexpected = {label for k, label in zip(keys, labels) if k != '' and k not in value_map}
+        new_values = unexpected - plan['reported_values']
+        if new_values and warn:
+            plan['reported_values'].update(new_values)
+            warn(f"⚠️ Unexpected {col} values kept as-is: {', '.join(sorted(map(str, new_values)))}")
+    else:
+        # No fixed vocabulary - the most common spelling wins
+        counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+        best = {}
+        for i, k in enumerate(keys):
+            if k not in best or counts[i] > counts[best[k]]:
+                best[k] = i
+        canonical = np.array([labels[best[k]] for k in keys], dtype=object)
+    
+    # Blank cells count as missing; code -1 picks the trailing NaN
+    canonical[np.array([isinstance(k, str) and k == '' for k in keys], dtype=bool)] = np.nan
+    return pd.Series(np.append(canonical, np.nan)[codes], index=series.index, name=series.name)
+
+def apply_normalization_plan(df, plan, warn=None):
+    """Apply a compiled plan to a freshly read sheet"""
+    df = df.rename(columns=plan['renames'])
+    
+    for col in plan['date_columns']:
+        df[col] = parse_date_column(df[col])
+    
+    # Calculate days remaining
+    if 'Target Date' in df.columns:
+        df['Days Remaining'] = (df['Target Date'] - pd.Timestamp.now()).dt.days
+    
+    for col, value_map in plan['value_maps'].items():
+        df[col] = canonicalize_column(df[col], value_map, plan, col, warn)
+    
+    if 'Status' in df.columns:
+        df['Status'] = df['Status'].fillna('Not Started')
+    else:
+        df['Status'] = 'Not Started'
+    
+    return df
+
+def build_cube(df):
+    """Count rows per distinct combination of the dashboard dimensions.
+    
+    Each dimension is factorized to integer codes (missing values get a code of their own,
+    Target Date is bucketed by day). Rows are also indexed by cell so a set of cells can be
+    turned back into row positions without scanning the frame.
+    """
+    dimensions = [col for col in CUBE_DIMENSIONS if col in df.columns]
+    codes = {}
+    labels = {}
+    for col in dimensions:
+        values = df[col].dt.normalize() if col == 'Target Date' else df[col]
+        codes[col], labels[col] = pd.factorize(values, use_na_sentinel=False)
+    
+    if dimensions:
+        row_cells = pd.DataFrame(codes).groupby(dimensions, sort=False).ngroup().to_numpy()
+    else:
+        row_cells = np.zeros(len(df), dtype=np.int64)
+    _, first_rows = np.unique(row_cells, return_index=True)
+    counts = np.bincount(row_cells)
+    
+    return {
+        'dimensions': dimensions,
+        'labels': labels,
+        'codes': {col: codes[col][first_rows] for col in dimensions},
+        'counts': counts,
+        # int32 so the row positions cut from it (held by every session) take half the memory
+        'row_order': np.argsort(row_cells, kind='stable').astype(np.int32),
+        'offsets': np.cumsum(counts) - counts
+    }
+
+def cube_filter(cube, col, selected):
+    """Boolean mask over cube cells whose `col` value is one of `selected`"""
+    allowed = cube['labels'][col].isin(selected)
+    return allowed[cube['codes'][col]]
+
+def cube_counts(cube, cells, by):
+    """Sum the counts of the selected cells grouped by one or more dimensions (missing values dropped)"""
+    frame = pd.DataFrame({col: cube['labels'][col].take(cube['codes'][col][cells]) for col in by})
+    frame['Count'] = cube['counts'][cells]
+    return frame.groupby(by, sort=False)['Count'].sum()
+
+def cube_positions(cube, cells):
+    """Row positions covered by the selected cells, in sheet order"""
+    counts = cube['counts'][cells]
+    # Expand each cell's [offset, offset + count) slice of row_order in one go
+    starts = np.repeat(cube['offsets'][cells] - (np.cumsum(counts) - counts), counts)
+    return np.sort(cube['row_order'][starts + np.arange(counts.sum())])
+
+def select_cells(cube, filters):
+    """Cube cells matching a set of dashboard filters.
+    
+    `filters` maps a dimension to its selected values and 'Target Date' to a (start, end) pair of dates.
+    As in the sidebar, an empty selection leaves a dimension unfiltered - except Status.
+    """
+    cell_mask = np.ones(len(cube['counts']), dtype=bool)
+    
+    for col, selected in filters.items():
+        if col not in cube['dimensions']:
+            continue
+        if col == 'Target Date':
+            if selected and len(selected) == 2:
+                start_date, end_date = selected
+                # The cube buckets Target Date by day, so compare whole days
+                target_days = cube['labels']['Target Date']
+                in_range = (target_days >= pd.Timestamp(start_date)) & (target_days <= pd.Timestamp(end_date))
+                cell_mask &= np.asarray(in_range)[cube['codes']['Target Date']]
+        elif selected or col == 'Status':
+            cell_mask &= cube_filter(cube, col, selected)
+    
+    # Each session keeps its selection between reruns, so keep it compact
+    return np.flatnonzero(cell_mask).astype(np.int32)
+
+def compute_kpis(cube, cells):
+    """Values for the KPI cards - every card is a sum over the selected cube cells"""
+    category_totals = cube_counts(cube, cells, ['Category']) if 'Category' in cube['dimensions'] else pd.Series(dtype=int)
+    status_totals = cube_counts(cube, cells, ['Status'])
+    return {
+        'resources': len(cube_counts(cube, cells, ['Engineer Name'])) if 'Engineer Name' in cube['dimensions'] else 0,
+        'total': int(cube['counts'][cells].sum()),
+        'sales': int(category_totals.get('Sales', 0)),
+        'pre_sales': int(category_totals.get('Pre-Sales', 0)),
+        'post_sales': int(category_totals.get('Post-Sales', 0)),
+        'completed': int(status_totals.get('Completed', 0)),
+        'in_progress': int(status_totals.get('In Progress', 0)),
+        'not_started': int(status_totals.get('Not Started', 0))
+    }
+
+def build_option_index(cube):
+    """Per-dimension filter options (sorted, missing last) and labels ranked by their total count"""
+    options = {}
+    ranked = {}
+    for col in [col for col in FILTER_DIMENSIONS if col in cube['dimensions']]:
+        labels = cube['labels'][col]
+        options[col] = sorted(labels, key=lambda value: (pd.isna(value), str(value)))
+        totals = np.bincount(cube['codes'][col], weights=cube['counts'], minlength=len(labels))
+        ranked[col] = labels.take(np.argsort(-totals, kind='stable'))
+    return options, ranked
+
+def collapse_tail(totals, ranked, top_n, other_label='Other'):
+    """Keep the top_n largest of the charted totals and sum the rest into other_label (ties go to the label ranked higher overall)"""
+    if len(totals) <= top_n:
+        return totals
+    # totals is already aggregated and small; the snapshot-wide order only breaks ties, since nlargest keeps the first
+    kept = totals.reindex(ranked[ranked.isin(totals.index)]).nlargest(top_n)
+    other = pd.Series([totals.sum() - kept.sum()], index=pd.Index([other_label], name=totals.index.name))
+    return pd.concat([kept, other])
+
+def build_snapshot(content, version, warn=None):
+    """Parse a downloaded workbook into a snapshot every session reads from without copying"""
+    df = pd.read_excel(BytesIO(content), sheet_name="for dashboard", engine='openpyxl')
+    
+    # Renames, date parsing and value cleanup come from the cached plan for this header row
+    plan = get_normalization_plan(list(df.columns), warn)
+    df = apply_normalization_plan(df, plan, warn)
+    
+    # Format dates once here instead of on every rerun (also avoids Arrow conversion errors)
+    display = {}
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            display[col] = df[col].dt.strftime('%d/%m/%y').fillna('').replace('NaT', '')
+    
+    # Status with the colour marker used in the footer legend, for the detail table
+    status_badges = df['Status'].map(STATUS_BADGES).fillna(df['Status'])
+    
+    # First and last Target Date - the limits of the sidebar date picker and of report presets
+    date_bounds = None
+    if 'Target Date' in df.columns and df['Target Date'].notna().any():
+        date_bounds = (df['Target Date'].min().date(), df['Target Date'].max().date())
+    
+    # Filter options and chart rankings are read from here on every rerun instead of rescanning the frame
+    cube = build_cube(df)
+    options, ranked = build_option_index(cube)
+    
+    return {
+        'version': version,
+        'df': df,
+        'display': display,
+        'status_badges': status_badges,
+        'cube': cube,
+        'options': options,
+        'ranked': ranked,
+        'date_bounds': date_bounds
+    }
+
+def get_snapshot(content, warn=None):
+    """Return the snapshot for this workbook, building it only when the data changed"""
+    version = hashlib.sha1(content).hexdigest()
+    # Days Remaining is relative to today, so a new day means a new snapshot
+    key = (version, pd.Timestamp.now().date())
+    snapshot = _snapshots.get(key)
+    if snapshot is None:
+        snapshot = build_snapshot(content, version, warn)
+        _snapshots.clear()
+        _snapshots[key] = snapshot
+    return snapshot
+
+def select_columns(snapshot, positions, columns, formatted=False):
+    """Read only the given columns of the selected rows from a snapshot.
+    
+    With formatted=True, date columns come back as their DD/MM/YY display strings.
+    Columns the sheet doesn't have are skipped, so callers keep their `in .columns` checks.
+    """
+    base = snapshot['df']
+    data = {}
+    for col in columns:
+        if formatted and col in snapshot['display']:
+            data[col] = snapshot['display'][col].iloc[positions]
+        elif col in base.columns:
+            data[col] = base[col].iloc[positions]
+    return pd.DataFrame(data)
+
+def build_kpi_card_html(title, value, card_style='', text_style=''):
+    """One metric card; styles override the default gradient"""
+    card_attr = f' style="{card_style}"' if card_style else ''
+    text_attr = f' style="{text_style}"' if text_style else ''
+    return f"""
+        <div class="metric-card"{card_attr}>
+            <h4{text_attr}>{title}</h4>
+            <h2{text_attr}>{value}</h2>
+        </div>
+    """
+
+def build_category_pie(category_totals):
+    """Donut chart of certifications per category"""
+    category_counts = category_totals.sort_values(ascending=False, kind='stable').reset_index()
+    category_counts.columns = ['Category', 'Count']
+    
+    # Professional color palette for categories
+    colors = {'Sales': '#2E4057',      # Dark blue-gray
+             'Pre-Sales': '#4A6FA5',   # Muted blue
+             'Post-Sales': '#6B4E71'}   # Muted purple
+    
+    # Create donut chart for more modern look
+    fig = px.pie(category_counts, values='Count', names='Category', 
+                 title='Distribution by Category',
+                 color='Category', 
+                 color_discrete_map=colors,
+                 hole=0.4)  # Creates donut chart
+    
+    # Update layout for professional appearance
+    fig.update_traces(
+        textposition='inside', 
+        textinfo='percent+label',
+        textfont=dict(size=12, color='white'),
+        marker=dict(line=dict(color='white', width=2)),
+        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
+    )
+    
+    fig.update_layout(
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=-0.2,
+            xanchor="center",
+            x=0.5,
+            font=dict(size=11)
+        ),
+        margin=dict(t=50, b=50, l=20, r=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        title=dict(
+            text="Distribution by Category",
+            font=dict(size=16, color='#1E3A8A'),
+            x=0.5,
+            xanchor='center'
+        )
+    )
+    
+    return fig
+
+def build_status_pie(status_totals):
+    """Donut chart of certifications per status"""
+    status_counts = status_totals.sort_values(ascending=False, kind='stable').reset_index()
+    status_counts.columns = ['Status', 'Count']
+    
+    # Professional color palette for status
+    colors = {'Completed': '#2E7D32',      # Dark green
+             'In Progress': "#F1CF37",      # Warm amber
+             'Not Started': '#D32F2F'}      # Dark red
+    
+    # Create donut chart for more modern look
+    fig = px.pie(status_counts, values='Count', names='Status', 
+                 title='Overall Status Distribution',
+                 color='Status', 
+                 color_discrete_map=colors,
+                 hole=0.4)  # Creates donut chart
+    
+    # Update layout for professional appearance
+    fig.update_traces(
+        textposition='inside', 
+        textinfo='percent+label',
+        textfont=dict(size=12, color='white'),
+        marker=dict(line=dict(color='white', width=2)),
+        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
+    )
+    
+    fig.update_layout(
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=-0.2,
+            xanchor="center",
+            x=0.5,
+            font=dict(size=11)
+        ),
+        margin=dict(t=50, b=50, l=20, r=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        title=dict(
+            text="Overall Status Distribution",
+            font=dict(size=16, color='#1E3A8A'),
+            x=0.5,
+            xanchor='center'
+        )
+    )
+    
+    return fig
+
+def build_area_bar(area_totals):
+    """Bar chart of certifications per enablement area"""
+    area_counts = area_totals.sort_values(ascending=False, kind='stable').reset_index()
+    area_counts.columns = ['Enablement Area', 'Count']
+    
+    # Professional bar chart styling
+    custom_blues = ['#1E3A8A', '#2563EB', '#3B82F6', '#60A5FA', '#93C5FD', '#BFDBFE']
+    fig = px.bar(area_counts, x='Enablement Area', y='Count', 
+         color='Enablement Area',
+         color_discrete_sequence=custom_blues,
+         title='Certifications by Area')
+    
+    fig.update_layout(
+        xaxis_title="Enablement Area",
+        yaxis_title="Number of Certifications",
+        showlegend=False,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        title=dict(
+            text="Certifications by Area",
+            font=dict(size=16, color='#1E3A8A'),
+            x=0.5,
+            xanchor='center'
+        )
+    )
+    
+    fig.update_traces(
+        marker_line_color='white',
+        marker_line_width=1,
+        opacity=0.8,
+        hovertemplate='<b>%{x}</b><br>Count: %{y}<extra></extra>'
+    )
+    
+    return fig
+
+def build_category_status_bar(category_status):
+    """Stacked bar of statuses within each category (category_status is a crosstab)"""
+    # Professional color palette for status
+    status_colors = {'Completed': '#2E7D32', 'In Progress': "#F1CF37", 'Not Started': '#D32F2F'}
+    
+    fig = px.bar(category_status, barmode='stack', 
+                 title='Status Distribution by Category',
+                 color_discrete_map=status_colors)
+    
+    fig.update_layout(
+        xaxis_title="Category",
+        yaxis_title="Number of Certifications",
+        legend_title="Status",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        title=dict(
+            text="Status Distribution by Category",
+            font=dict(size=16, color='#1E3A8A'),
+            x=0.5,
+            xanchor='center'
+        ),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="center",
+            x=0.5
+        )
+    )
+    
+    fig.update_traces(
+        marker_line_color='white',
+        marker_line_width=1,
+        opacity=0.8,
+        hovertemplate='<b>%{x}</b><br>Status: %{legend}<br>Count: %{y}<extra></extra>'
+    )
+    
+    return fig
+
+def coarsen_timeline(timeline_counts, freq):
+    """Per-day timeline counts merged into periods ('W' weeks, 'M' months), each dated by its first day"""
+    dates = timeline_counts.index.get_level_values('Target Date').to_period(freq).start_time.rename('Target Date')
+    return timeline_counts.groupby([dates, timeline_counts.index.get_level_values('Status')]).sum()
+
+def build_timeline(timeline_counts):
+    """Stacked bar of certifications per target date and status"""
+    timeline_data = timeline_counts.reset_index()
+    timeline_data['Target Date'] = timeline_data['Target Date'].dt.date
+    timeline_data = timeline_data.sort_values(['Target Date', 'Status'], ignore_index=True)
+    timeline_data.columns = ['Target Date', 'Status', 'Count']
+    
+    # Professional color palette for status
+    status_colors = {'Completed': '#2E7D32', 'In Progress': "#F1CF37", 'Not Started': '#D32F2F'}
+    
+    fig = px.bar(timeline_data, x='Target Date', y='Count', color='Status',
+                  title='Certifications by Target Date',
+                  color_discrete_map=status_colors)
+    
+    fig.update_layout(
+        xaxis_title="Target Date",
+        yaxis_title="Number of Certifications",
+        legend_title="Status",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        title=dict(
+            text="Certifications by Target Date",
+            font=dict(size=16, color='#1E3A8A'),
+            x=0.5,
+            xanchor='center'
+        ),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="center",
+            x=0.5
+        )
+    )
+    
+    fig.update_traces(
+        marker_line_color='white',
+        marker_line_width=1,
+        opacity=0.8,
+        hovertemplate='<b>%{x}</b><br>Status: %{legend}<br>Count: %{y}<extra></extra>'
+    )
+    
+    return fig
+
+def truncated_row_html(remaining, what, colspan):
+    """Closing table row saying how many rows were left out to stay within the payload budget"""
+    return (f"<tr><td colspan='{colspan}' style='text-align: center; padding: 8px; border: 1px solid #dee2e6; color: gray;'>"
+            f"… {remaining} more {what} not shown - download the CSV for the full list</td></tr>")
+
+def table_rows_html(df, what, closing, max_bytes, cell_open, row_open, used):
+    """Table body rows, stopping where the table (used bytes so far + rows + closing markup) would pass max_bytes"""
+    rows_html = ""
+    # Sizes are UTF-8 bytes, as payload_bytes measures them; the closing markup and the "not shown" row are kept free
+    reserve = len(closing.encode('utf-8')) + len(truncated_row_html(len(df), what, len(df.columns)).encode('utf-8'))
+    for i, (_, row) in enumerate(df.iterrows()):
+        row_html = row_open(i) + "".join(f"{cell_open}{row[col]}</td>" for col in df.columns) + "</tr>"
+        row_bytes = len(row_html.encode('utf-8'))
+        if max_bytes and used + row_bytes + reserve > max_bytes:
+            rows_html += truncated_row_html(len(df) - i, what, len(df.columns))
+            break
+        rows_html += row_html
+        used += row_bytes
+    return rows_html
+
+def build_engineer_summary_html(summary_df, max_bytes=None):
+    """Per-engineer totals and completion rate - HTML TABLE APPROACH FOR CENTER ALIGNMENT (rows stop at max_bytes)"""
+    engineer_summary = summary_df.groupby('Engineer Name').agg({
+        'Category': lambda x: ', '.join(x.unique()) if 'Category' in summary_df.columns else 'N/A',
+        'Assigned Certification': 'count' if 'Assigned Certification' in summary_df.columns else 'size',
+        'Status': [
+            ('Completed', lambda x: (x == 'Completed').sum()),
+            ('In Progress', lambda x: (x == 'In Progress').sum()),
+            ('Not Started', lambda x: (x == 'Not Started').sum())
+        ]
+    }).reset_index()
+    
+    engineer_summary.columns = ['Engineer Name', 'Categories', 'Total Certs', 'Completed', 'In Progress', 'Not Started']
+    engineer_summary['Completion Rate'] = (engineer_summary['Completed'] / engineer_summary['Total Certs'] * 100).round(1)
+    
+    # Format the Completion Rate column
+    engineer_summary['Completion Rate'] = engineer_summary['Completion Rate'].astype(str) + '%'
+    
+    # Convert to HTML table with inline styles for center alignment
+    html_table = "<div style='overflow-x: auto;'><table style='width:100%; border-collapse: collapse; margin: 10px 0; font-size: 14px; font-family: sans-serif; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>"
+    
+    # Add headers
+    html_table += "<thead><tr style='background-color: #1E3A8A; color: white;'>"
+    for col in engineer_summary.columns:
+        html_table += f"<th style='text-align: center; padding: 12px; border: 1px solid #dee2e6; font-weight: bold;'>{col}</th>"
+    html_table += "</tr></thead><tbody>"
+    
+    # Closing markup plus some CSS for hover effect
+    closing = "</tbody></table></div>" + """
+    <style>
+        table tr:hover {
+            background-color: #e9ecef !important;
+        }
+        table tr:hover td {
+            background-color: #e9ecef !important;
+        }
+    </style>
+    """
+    
+    # Add data rows with alternating colors
+    html_table += table_rows_html(engineer_summary, 'engineers', closing, max_bytes, "<td style='text-align: center; padding: 10px; border: 1px solid #dee2e6;'>",
+                                  lambda i: f"<tr style='background-color: {'#f8f9fa' if i % 2 == 0 else 'white'};'>",
+                                  len(html_table.encode('utf-8')))
+    
+    return html_table + closing
+
+def build_deadlines_html(upcoming_display, max_bytes=None):
+    """Upcoming deadlines as an HTML table for center alignment (rows stop at max_bytes)"""
+    html_table = "<div style='overflow-x: auto;'><table style='width:100%; border-collapse: collapse; margin: 10px 0; font-size: 14px; font-family: sans-serif;'>"
+    
+    # Add headers
+    html_table += "<thead><tr style='background-color: #f0f2f6; font-weight: bold;'>"
+    for col in upcoming_display.columns:
+        html_table += f"<th style='text-align: center; padding: 10px; border: 1px solid #dee2e6;'>{col}</th>"
+    html_table += "</tr></thead><tbody>"
+    
+    # Add data rows
+    closing = "</tbody></table></div>"
+    html_table += table_rows_html(upcoming_display, 'deadlines', closing, max_bytes, "<td style='text-align: center; padding: 8px; border: 1px solid #dee2e6;'>",
+                                  lambda i: "<tr>", len(html_table.encode('utf-8')))
+    
+    return html_table + closing
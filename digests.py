@@ -0,0 +1,290 @@
+"""Deadline and overdue digests for unfinished certifications.
+
+The engine keeps every unfinished, dated certification in a queue ordered by Target Date, so each
+window (overdue, next 7/14/30 days - see DIGEST_WINDOWS) is a slice found by binary search rather
+than a scan. When a new data version arrives it diffs the queue against the previous one, and only
+the engineers and categories whose entries changed - or whose entries crossed a window edge because
+the day moved on - get their digest rebuilt.
+
+Digests are written as text files under digests/engineers and digests/categories, or mailed through
+an SMTP server (for example a local stand-in such as `python -m aiosmtpd -n -l localhost:1025`).
+The dashboard's Upcoming Deadlines section reads its rows from an engine kept with each snapshot.
+
+    python digests.py                         # update digests for the current data
+    python digests.py --watch 900             # keep running, re-evaluating every 15 minutes
+    python digests.py --smtp localhost:1025 --recipients digest_recipients.json
+
+The recipients file maps names to addresses: {"engineers": {...}, "categories": {...}}.
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import smtplib
+import threading
+import time
+from datetime import date
+from email.message import EmailMessage
+
+import numpy as np
+import pandas as pd
+
+from dashboard_data import fetch_workbook, get_snapshot, slugify
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DIGESTS_DIR = os.environ.get('VMWARE_DASHBOARD_DIGESTS', os.path.join(BASE_DIR, 'digests'))
+STATE_NAME = 'state.pkl'
+STATE_FIELDS = ['version', 'today', 'queue', 'digest_hashes']
+
+# Window name -> (first day, last day) relative to today, both inclusive; None is open-ended
+DIGEST_WINDOWS = {
+    'Overdue': (None, -1),
+    'Next 7 days': (0, 7),
+    'Next 14 days': (0, 14),
+    'Next 30 days': (0, 30)
+}
+
+# Digest groups: directory name -> column the queue is grouped by
+DIGEST_GROUPS = {'engineers': 'Engineer Name', 'categories': 'Category'}
+
+QUEUE_COLUMNS = ['Target Date', 'Engineer Name', 'Category', 'Enablement Area', 'Assigned Certification', 'Status']
+
+
+class DeadlineDigestEngine:
+    """Deadline-ordered queue of unfinished certifications, evaluated incrementally per data version"""
+
+    def __init__(self, windows=None):
+        self.windows = dict(windows or DIGEST_WINDOWS)
+        self.version = None
+        self.today = None
+        self.queue = self._empty_queue()
+        self.digest_hashes = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _empty_queue():
+        return pd.DataFrame({col: pd.Series(dtype=object) for col in QUEUE_COLUMNS + ['position']})
+
+    @staticmethod
+    def build_queue(snapshot):
+        """Unfinished, dated rows of a snapshot, keyed by certification and sorted by Target Date"""
+        df = snapshot['df']
+        if 'Target Date' not in df.columns:
+            return DeadlineDigestEngine._empty_queue()
+
+        unfinished = np.flatnonzero(((df['Status'] != 'Completed') & df['Target Date'].notna()).to_numpy())
+        queue = pd.DataFrame({
+            col: (df[col].iloc[unfinished].to_numpy() if col in df.columns else np.full(len(unfinished), np.nan, dtype=object))
+            for col in QUEUE_COLUMNS
+        })
+        # Windows are whole days, like the timeline
+        queue['Target Date'] = pd.to_datetime(queue['Target Date']).dt.normalize()
+        queue['position'] = unfinished
+
+        # A certification is identified by who holds it and what it is; repeats get an occurrence number
+        ids = queue['Engineer Name'].astype(str) + '\x1f' + queue['Assigned Certification'].astype(str)
+        queue.index = ids + '\x1f' + queue.groupby(ids).cumcount().astype(str)
+        return queue.sort_values(['Target Date', 'position'], kind='stable')
+
+    def update(self, snapshot, today=None):
+        """Bring the queue up to date; return {group dir: set of names} whose digests need rebuilding"""
+        today = pd.Timestamp(today or date.today()).normalize()
+        with self._lock:
+            if snapshot['version'] == self.version and today == self.today:
+                return {group: set() for group in DIGEST_GROUPS}
+
+            dirty = {group: set() for group in DIGEST_GROUPS}
+            old = self.queue
+            new = self.build_queue(snapshot) if snapshot['version'] != self.version else old
+
+            if new is not old:
+                # Entries added, removed or edited since the last version
+                content = QUEUE_COLUMNS
+                union = old.index.union(new.index)
+                before = old[content].reindex(union)
+                after = new[content].reindex(union)
+                changed = union[((before != after) & ~(before.isna() & after.isna())).any(axis=1).to_numpy()]
+                for group, col in DIGEST_GROUPS.items():
+                    dirty[group].update(before.loc[changed, col].dropna())
+                    dirty[group].update(after.loc[changed, col].dropna())
+
+            if self.today is not None and today != self.today:
+                # The day moved on: entries that crossed any window edge change digest
+                crossed = self._crossed_edges(new, self.today, today)
+                for group, col in DIGEST_GROUPS.items():
+                    dirty[group].update(new[col].iloc[crossed].dropna())
+            elif self.today is None:
+                for group, col in DIGEST_GROUPS.items():
+                    dirty[group].update(new[col].dropna())
+
+            self.queue = new
+            self.version = snapshot['version']
+            self.today = today
+            return dirty
+
+    def _crossed_edges(self, queue, old_today, new_today):
+        """Queue rows whose Target Date lies between an edge's old and new position"""
+        targets = queue['Target Date'].to_numpy()
+        low, high = sorted([old_today, new_today])
+        rows = []
+        for first, last in self.windows.values():
+            for offset, side in ((first, 'left'), (last, 'right')):
+                if offset is None:
+                    continue
+                start = np.searchsorted(targets, (low + pd.Timedelta(days=offset)).to_datetime64(), side)
+                end = np.searchsorted(targets, (high + pd.Timedelta(days=offset)).to_datetime64(), side)
+                rows.append(np.arange(start, end))
+        return np.unique(np.concatenate(rows)) if rows else np.array([], dtype=int)
+
+    def _window_slice(self, targets, name):
+        first, last = self.windows[name]
+        start = 0 if first is None else np.searchsorted(targets, (self.today + pd.Timedelta(days=first)).to_datetime64(), 'left')
+        end = np.searchsorted(targets, (self.today + pd.Timedelta(days=last)).to_datetime64(), 'right')
+        return slice(start, end)
+
+    def window(self, name, queue=None):
+        """Queue entries falling in a window, in deadline order"""
+        queue = self.queue if queue is None else queue
+        return queue.iloc[self._window_slice(queue['Target Date'].to_numpy(), name)]
+
+    def window_positions(self, name):
+        """Snapshot row positions in a window, in sheet order"""
+        with self._lock:
+            return np.sort(self.window(name)['position'].to_numpy().astype(np.int64))
+
+    def digest(self, group, name):
+        """Plain-text digest of every window for one engineer or category"""
+        col = DIGEST_GROUPS[group]
+        entries = self.queue[self.queue[col] == name]
+        lines = [f"VMware certification deadlines - {name}",
+                 f"As of {self.today:%d/%m/%y} | data version {self.version[:12]}", ""]
+        for window_name in self.windows:
+            rows = self.window(window_name, entries)
+            lines.append(f"{window_name} ({len(rows)})")
+            for _, row in rows.iterrows():
+                who = row['Category'] if group == 'engineers' else row['Engineer Name']
+                lines.append(f"  {row['Target Date']:%d/%m/%y}  {row['Assigned Certification']}  "
+                             f"[{row['Status']}]  {who} / {row['Enablement Area']}")
+            lines.append("")
+        return '\n'.join(lines)
+
+    def summary(self):
+        """Window sizes across the whole queue"""
+        return {name: len(self.window(name)) for name in self.windows}
+
+
+def get_live_engine(snapshot):
+    """The dashboard's deadline engine for this snapshot, shared by every session reading it.
+
+    Each snapshot carries its own engine, so sessions still on an older data version never swap
+    the queue - and the row positions it hands out - under sessions on the newer one.
+    """
+    engine = snapshot.get('deadline_engine')
+    if engine is None:
+        engine = snapshot.setdefault('deadline_engine', DeadlineDigestEngine())
+    # A no-op unless the day changed
+    engine.update(snapshot)
+    return engine
+
+
+def load_engine(out_dir, windows=None):
+    """Engine for the configured windows, resumed from the last run's state, or a fresh one"""
+    engine = DeadlineDigestEngine(windows)
+    try:
+        with open(os.path.join(out_dir, STATE_NAME), 'rb') as f:
+            state = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return engine
+    for field in STATE_FIELDS:
+        setattr(engine, field, state[field])
+    # The windows were reconfigured since the last run: every digest needs re-evaluating
+    if state.get('windows') != engine.windows:
+        engine.today = None
+    return engine
+
+
+def save_engine(engine, out_dir):
+    path = os.path.join(out_dir, STATE_NAME)
+    with open(path + '.tmp', 'wb') as f:
+        # The windows are kept only to notice when they change - the configured ones always win
+        pickle.dump(dict({field: getattr(engine, field) for field in STATE_FIELDS}, windows=engine.windows), f)
+    os.replace(path + '.tmp', path)
+
+
+def publish_digests(engine, dirty, out_dir, smtp=None, sender=None, recipients=None):
+    """Write (or mail) the digests of dirty groups whose text actually changed; return how many went out"""
+    published = 0
+    for group, names in dirty.items():
+        for name in sorted(names, key=str):
+            text = engine.digest(group, name)
+            # The header carries the date and version; only the body decides whether anything changed
+            body_hash = hashlib.sha1(text.split('\n', 2)[2].encode('utf-8')).hexdigest()
+            if engine.digest_hashes.get((group, name)) == body_hash:
+                continue
+
+            if smtp:
+                address = (recipients or {}).get(group, {}).get(name)
+                if not address:
+                    continue
+                message = EmailMessage()
+                message['Subject'] = f"Certification deadlines - {name}"
+                message['From'] = sender
+                message['To'] = address
+                message.set_content(text)
+                smtp.send_message(message)
+            else:
+                os.makedirs(os.path.join(out_dir, group), exist_ok=True)
+                with open(os.path.join(out_dir, group, f'{slugify(name)}.txt'), 'w', encoding='utf-8') as f:
+                    f.write(text)
+
+            engine.digest_hashes[(group, name)] = body_hash
+            published += 1
+    return published
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workbook', help='read this .xlsx instead of downloading the live sheet')
+    parser.add_argument('--out', default=DIGESTS_DIR, help='digest and state directory (default: digests/)')
+    parser.add_argument('--smtp', metavar='HOST:PORT', help='mail digests through this SMTP server instead of writing files')
+    parser.add_argument('--sender', default='certification-dashboard@localhost', help='From address for mailed digests')
+    parser.add_argument('--recipients', help='JSON file mapping engineer and category names to addresses')
+    parser.add_argument('--watch', type=int, metavar='SECONDS', help='re-evaluate every SECONDS')
+    args = parser.parse_args()
+
+    recipients = None
+    if args.recipients:
+        with open(args.recipients, encoding='utf-8') as f:
+            recipients = json.load(f)
+
+    os.makedirs(args.out, exist_ok=True)
+    engine = load_engine(args.out)
+    while True:
+        if args.workbook:
+            with open(args.workbook, 'rb') as f:
+                content = f.read()
+        else:
+            content = fetch_workbook()
+
+        start = time.perf_counter()
+        dirty = engine.update(get_snapshot(content))
+        if args.smtp:
+            host, _, port = args.smtp.partition(':')
+            with smtplib.SMTP(host, int(port or 25)) as smtp:
+                published = publish_digests(engine, dirty, args.out, smtp, args.sender, recipients)
+        else:
+            published = publish_digests(engine, dirty, args.out)
+        save_engine(engine, args.out)
+
+        windows = ', '.join(f"{name}: {count}" for name, count in engine.summary().items())
+        print(f"Data version {engine.version[:12]}: {sum(map(len, dirty.values()))} group(s) re-evaluated, "
+              f"{published} digest(s) published in {time.perf_counter() - start:.2f}s [{windows}]")
+
+        if not args.watch:
+            break
+        time.sleep(args.watch)
+
+
+if __name__ == '__main__':
+    main()
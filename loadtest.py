@@ -0,0 +1,312 @@
+"""Concurrent-session load test for the certification dashboard.
+
+Serves a generated workbook from a local HTTP stand-in for SharePoint, points
+app3.py at it through VMWARE_DASHBOARD_SOURCE and drives N simulated viewers
+through Streamlit's AppTest, each replaying a sequence of filter changes.
+
+    python loadtest.py --concurrency 1,2,4,8 --rows 2000
+
+With --memory it instead opens sessions one at a time under tracemalloc and
+reports the memory each rerun allocates and each open session retains.
+
+    python loadtest.py --memory --sessions 5 --rows 20000
+"""
+import argparse
+import gc
+import os
+import random
+import resource
+import statistics
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app3.py')
+
+CATEGORIES = ['Sales', 'Pre-Sales', 'Post-Sales']
+AREAS = ['VCF', 'vSphere', 'NSX', 'vSAN', 'Aria', 'Tanzu', 'HCX', 'Avi']
+LEVELS = ['VCTA', 'VCP', 'VCAP', 'VCDX']
+STATUSES = ['Completed', 'In Progress', 'Not Started']
+
+
+def build_workbook(rows, engineers, seed=0):
+    """Generate a workbook shaped like the real 'for dashboard' sheet"""
+    rnd = random.Random(seed)
+    today = date.today()
+    records = []
+    for _ in range(rows):
+        target = today + timedelta(days=rnd.randint(-90, 180))
+        status = rnd.choice(STATUSES)
+        records.append({
+            'Sales / Pre-Sales / Post-Sales': rnd.choice(CATEGORIES),
+            'Enablement Area': rnd.choice(AREAS),
+            'Certification Level': rnd.choice(LEVELS),
+            'Engineer Name': f'Engineer {rnd.randint(1, engineers):03d}',
+            'Assigned Certification': f'{rnd.choice(LEVELS)} {rnd.choice(AREAS)} 2026',
+            'Target Date': target.strftime('%d/%m/%y'),
+            'Completion Date': target.strftime('%d/%m/%y') if status == 'Completed' else '',
+            'Status': status,
+            'Remarks': ''
+        })
+
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        pd.DataFrame(records).to_excel(writer, sheet_name='for dashboard', index=False)
+    return buffer.getvalue()
+
+
+class SharePointStandIn:
+    """Local HTTP server that serves one workbook and counts downloads"""
+
+    def __init__(self, content):
+        self.content = content
+        self.fetches = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stand_in._lock:
+                    stand_in.fetches += 1
+                    stand_in.bytes_sent += len(stand_in.content)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+                self.send_header('Content-Length', str(len(stand_in.content)))
+                self.end_headers()
+                self.wfile.write(stand_in.content)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/personal/dashboard.xlsx'
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset(self):
+        with self._lock:
+            self.fetches = 0
+            self.bytes_sent = 0
+
+
+class RssSampler:
+    """Background sampler for the peak resident set size of this process"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def current_rss():
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError):
+            # No procfs - fall back to the lifetime peak (KB on Linux, bytes on macOS)
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.current_rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = self.current_rss()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.current_rss())
+
+
+def sidebar_multiselect(at, label):
+    for widget in at.sidebar.multiselect:
+        if widget.label == label:
+            return widget
+    raise LookupError(f"No sidebar multiselect labelled {label!r}")
+
+
+def filter_sequence(at, rnd):
+    """Yield (step name, action) pairs that mimic a viewer exploring the dashboard"""
+    engineers = sidebar_multiselect(at, 'Engineer Name').options
+    areas = sidebar_multiselect(at, 'Enablement Area').options
+
+    yield 'status: hide completed', lambda: sidebar_multiselect(at, 'Status').set_value(['Not Started', 'In Progress'])
+    yield 'category: post-sales', lambda: sidebar_multiselect(at, 'Sales/Pre-Sales/Post-Sales').set_value(['Post-Sales'])
+    yield 'area: pick two', lambda: sidebar_multiselect(at, 'Enablement Area').set_value(rnd.sample(areas, min(2, len(areas))))
+    yield 'engineers: pick three', lambda: sidebar_multiselect(at, 'Engineer Name').set_value(rnd.sample(engineers, min(3, len(engineers))))
+    yield 'status: all', lambda: sidebar_multiselect(at, 'Status').set_value(STATUSES)
+    yield 'engineers: clear', lambda: sidebar_multiselect(at, 'Engineer Name').set_value([])
+    yield 'manual refresh', lambda: at.sidebar.button[0].click()
+
+
+def run_session(session_id, rounds, timeout):
+    """Open the dashboard once and replay the filter sequence; return rerun latencies"""
+    rnd = random.Random(session_id)
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    latencies = []
+
+    start = time.perf_counter()
+    at.run()
+    latencies.append(time.perf_counter() - start)
+    if at.exception:
+        raise RuntimeError(f"Session {session_id} failed on first load: {at.exception[0].value}")
+
+    for _ in range(rounds):
+        for step, action in filter_sequence(at, rnd):
+            action()
+            start = time.perf_counter()
+            at.run()
+            latencies.append(time.perf_counter() - start)
+            if at.exception:
+                raise RuntimeError(f"Session {session_id} failed on '{step}': {at.exception[0].value}")
+
+    return latencies
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run_level(stand_in, concurrency, rounds, timeout):
+    """Run `concurrency` sessions side by side and summarise them"""
+    stand_in.reset()
+    with RssSampler() as rss, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        results = list(pool.map(lambda i: run_session(i, rounds, timeout), range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies = [latency for session in results for latency in session]
+    return {
+        'concurrency': concurrency,
+        'reruns': len(latencies),
+        'throughput': len(latencies) / elapsed,
+        'p50': percentile(latencies, 50) * 1000,
+        'p90': percentile(latencies, 90) * 1000,
+        'p99': percentile(latencies, 99) * 1000,
+        'mean': statistics.mean(latencies) * 1000,
+        'peak_rss_mb': rss.peak / 1024 / 1024,
+        'fetches': stand_in.fetches,
+        'fetched_mb': stand_in.bytes_sent / 1024 / 1024
+    }
+
+
+def filter_own_engineers(at, session_id, sessions):
+    """Narrow a session to every sessions-th engineer, starting at its own id - no two sessions share a view"""
+    engineers = sidebar_multiselect(at, 'Engineer Name')
+    engineers.set_value(sorted(engineers.options)[session_id::sessions])
+    sidebar_multiselect(at, 'Status').set_value(['Not Started', 'In Progress'])
+
+
+def measure_session_memory(sessions, timeout):
+    """Trace the allocation peak of each rerun and the memory each open session keeps"""
+    # Warm-up session pays for imports and the shared snapshot, so it isn't counted
+    warm_up = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    warm_up.run()
+
+    gc.collect()
+    tracemalloc.start()
+    open_sessions = []
+    load_peaks = []
+    filter_peaks = []
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        for session_id in range(sessions):
+            at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+            # The first load is the same view for everyone; the filtered one is each session's own
+            for peaks, action in ((load_peaks, None), (filter_peaks, lambda: filter_own_engineers(at, session_id, sessions))):
+                if action:
+                    action()
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                at.run()
+                peaks.append(tracemalloc.get_traced_memory()[1] - before)
+                if at.exception:
+                    raise RuntimeError(f"Session {session_id} failed: {at.exception[0].value}")
+            open_sessions.append(at)
+        gc.collect()
+        retained = (tracemalloc.get_traced_memory()[0] - baseline) / sessions
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'sessions': sessions,
+        'load_peak_mb': statistics.median(load_peaks) / 1024 / 1024,
+        'filter_peak_mb': statistics.median(filter_peaks) / 1024 / 1024,
+        'retained_mb': retained / 1024 / 1024
+    }
+
+
+def print_report(rows):
+    header = (f"{'sessions':>8} {'reruns':>7} {'rerun/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} "
+              f"{'mean ms':>8} {'peak RSS MB':>12} {'fetches':>8} {'fetch/rerun':>11} {'fetched MB':>11}")
+    print(header)
+    print('-' * len(header))
+    for r in rows:
+        print(f"{r['concurrency']:>8} {r['reruns']:>7} {r['throughput']:>8.2f} {r['p50']:>8.0f} {r['p90']:>8.0f} "
+              f"{r['p99']:>8.0f} {r['mean']:>8.0f} {r['peak_rss_mb']:>12.1f} {r['fetches']:>8} "
+              f"{r['fetches'] / r['reruns']:>11.2f} {r['fetched_mb']:>11.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', default='1,2,4,8',
+                        help='comma-separated numbers of simultaneous sessions (default: 1,2,4,8)')
+    parser.add_argument('--rounds', type=int, default=2, help='filter sequences replayed per session')
+    parser.add_argument('--rows', type=int, default=1000, help='rows in the generated workbook')
+    parser.add_argument('--engineers', type=int, default=60, help='distinct engineers in the generated workbook')
+    parser.add_argument('--workbook', help='serve this .xlsx instead of a generated one')
+    parser.add_argument('--timeout', type=float, default=120, help='seconds allowed per rerun')
+    parser.add_argument('--memory', action='store_true', help='run the memory-per-session benchmark instead')
+    parser.add_argument('--sessions', type=int, default=5, help='sessions opened by the memory benchmark')
+    args = parser.parse_args()
+
+    if args.workbook:
+        with open(args.workbook, 'rb') as f:
+            content = f.read()
+    else:
+        content = build_workbook(args.rows, args.engineers)
+
+    levels = [int(level) for level in args.concurrency.split(',') if level.strip()]
+    with SharePointStandIn(content) as stand_in:
+        os.environ['VMWARE_DASHBOARD_SOURCE'] = stand_in.url
+        print(f"Serving {len(content) / 1024:.0f} KB workbook at {stand_in.url}")
+        if args.memory:
+            result = measure_session_memory(args.sessions, args.timeout)
+            print(f"Sessions measured:            {result['sessions']}")
+            print(f"Peak allocated, first load:   {result['load_peak_mb']:.1f} MB (median per session)")
+            print(f"Peak allocated, filter rerun: {result['filter_peak_mb']:.1f} MB (median per session)")
+            print(f"Retained per open session:    {result['retained_mb']:.1f} MB")
+            return
+        rows = []
+        for level in levels:
+            rows.append(run_level(stand_in, level, args.rounds, args.timeout))
+            print(f"  {level} concurrent session(s) done")
+        print()
+        print_report(rows)
+
+
+if __name__ == '__main__':
+    main()
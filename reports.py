@@ -0,0 +1,329 @@
+"""Pre-render saved filter presets to static HTML reports.
+
+Reuses the dashboard's load and aggregation code (dashboard_data.py) to render every preset in
+report_presets.json to a self-contained HTML file - KPI cards, charts and tables, plotly.js inlined -
+in parallel across a process pool. A manifest records the data version and the day the reports were
+built, and the live dashboard links to a report whenever its filters match a preset on that version
+and day - relative dates ("this_month", the next-7-days deadlines) move with the day.
+
+    python reports.py                 # render if the data version or the day changed since the last run
+    python reports.py --force         # render regardless
+    python reports.py --watch 300     # keep polling and re-render after each data-version or day change
+
+Presets are a JSON list of {"name": ..., "filters": {...}}. Filters use the sidebar's dimensions
+(Category, Enablement Area, Certification Level, Engineer Name, Status) mapped to lists of values,
+plus an optional "Target Date" of "this_month", "next_30_days" or ["YYYY-MM-DD", "YYYY-MM-DD"].
+Without one a preset covers the sidebar's default range - every dated row, as the live view does.
+A team lead's view is just their engineers:
+
+    {"name": "Team: <lead>", "filters": {"Engineer Name": ["<engineer>", "<engineer>"]}}
+
+Streamlit can't serve the HTML files itself, so publish the reports directory with any static web
+server and set VMWARE_DASHBOARD_REPORTS_URL to its base URL. The dashboard only offers the link when
+that variable is set; without it, viewers see no report notice.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from html import escape
+
+import pandas as pd
+
+from dashboard_data import (
+    DASHBOARD_CSS, FILTER_DIMENSIONS, KPI_CARDS, STATUS_VALUES,
+    fetch_workbook, get_snapshot, slugify, select_cells, cube_positions, cube_counts, select_columns, compute_kpis,
+    build_kpi_card_html, build_category_pie, build_status_pie, build_area_bar, build_category_status_bar,
+    build_timeline, build_engineer_summary_html, build_deadlines_html
+)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRESETS_PATH = os.environ.get('VMWARE_DASHBOARD_PRESETS', os.path.join(BASE_DIR, 'report_presets.json'))
+REPORTS_DIR = os.environ.get('VMWARE_DASHBOARD_REPORTS', os.path.join(BASE_DIR, 'reports'))
+MANIFEST_NAME = 'manifest.json'
+
+DETAIL_COLUMNS = ['Category', 'Enablement Area', 'Certification Level', 'Engineer Name',
+                  'Assigned Certification', 'Target Date', 'Completion Date', 'Status', 'Remarks']
+DEADLINE_COLUMNS = ['Engineer Name', 'Category', 'Enablement Area', 'Assigned Certification', 'Target Date', 'Status']
+
+REPORT_CSS = """
+    <style>
+    body { font-family: sans-serif; margin: 2rem; }
+    .kpi-row { display: grid; grid-template-columns: repeat(8, 1fr); gap: 1rem; }
+    .chart-row { display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; }
+    .report-meta { color: gray; }
+    table.detail { width: 100%; border-collapse: collapse; font-size: 13px; }
+    table.detail th { background-color: #f0f2f6; }
+    table.detail th, table.detail td { padding: 6px; border: 1px solid #dee2e6; text-align: center; }
+    </style>
+"""
+
+
+def load_presets(path=PRESETS_PATH):
+    """Read the preset list, giving each preset a slug for its file name"""
+    with open(path, encoding='utf-8') as f:
+        presets = json.load(f)
+    for preset in presets:
+        preset.setdefault('slug', slugify(preset['name']))
+    return presets
+
+
+# Manifest path -> (modification stamp, manifest); the dashboard asks on every rerun
+_manifests = {}
+
+
+def load_manifest(reports_dir=REPORTS_DIR):
+    """The manifest written by the last render, or None if there hasn't been one (re-read only when the file changes)"""
+    path = os.path.join(reports_dir, MANIFEST_NAME)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _manifests.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    _manifests[path] = (stamp, manifest)
+    return manifest
+
+
+def resolve_preset(snapshot, preset, today=None):
+    """Turn a preset's filter spec into the filters dict the dashboard builds from its sidebar"""
+    spec = preset.get('filters', {})
+    filters = {col: list(spec.get(col, [])) for col in FILTER_DIMENSIONS}
+    if 'Status' not in spec:
+        filters['Status'] = list(STATUS_VALUES)
+
+    target = spec.get('Target Date')
+    bounds = snapshot['date_bounds']
+    if bounds and not target:
+        # The sidebar always sends a date range, which leaves out undated rows - so does a preset
+        filters['Target Date'] = bounds
+    elif target and bounds:
+        today = today or date.today()
+        if target == 'this_month':
+            start = today.replace(day=1)
+            end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        elif target == 'next_30_days':
+            start, end = today, today + timedelta(days=30)
+        else:
+            start, end = (date.fromisoformat(d) for d in target)
+        # The date picker can't go past the data, so neither can a preset
+        filters['Target Date'] = (max(start, bounds[0]), min(end, bounds[1]))
+    return filters
+
+
+def filter_signature(snapshot, filters):
+    """Canonical form of a filters dict, so selections that mean the same thing compare equal"""
+    cube = snapshot['cube']
+    signature = []
+    for col in FILTER_DIMENSIONS:
+        if col not in cube['dimensions']:
+            continue
+        selected = frozenset(filters.get(col) or [])
+        if col == 'Status':
+            signature.append((col, selected))
+            continue
+        options = frozenset(cube['labels'][col].dropna())
+        # Nothing selected, or everything, both mean "no filter" for these dimensions
+        signature.append((col, None if not selected or selected >= options else selected))
+
+    # Even the full range is a filter: it drops rows without a Target Date
+    date_range = filters.get('Target Date')
+    if 'Target Date' in cube['dimensions'] and date_range and len(date_range) == 2:
+        signature.append(('Target Date', tuple(date_range)))
+    return tuple(signature)
+
+
+def is_current(manifest, version):
+    """Whether a manifest's reports were rendered today from this data version"""
+    return bool(manifest) and manifest.get('version') == version and manifest.get('rendered_on') == date.today().isoformat()
+
+
+def match_preset(manifest, snapshot, filters):
+    """The manifest entry whose preset matches these filters on this snapshot's data and today's date, if any"""
+    if not is_current(manifest, snapshot['version']):
+        return None
+    signature = filter_signature(snapshot, filters)
+    for entry in manifest['reports']:
+        if filter_signature(snapshot, resolve_preset(snapshot, entry)) == signature:
+            return entry
+    return None
+
+
+def describe_filters(spec):
+    if not spec:
+        return 'All certifications'
+    parts = []
+    for col, value in spec.items():
+        parts.append(f"{col}: {value if isinstance(value, str) else ', '.join(map(str, value))}")
+    return ' | '.join(parts)
+
+
+def render_report(snapshot, preset, generated_at):
+    """Render one preset to a self-contained HTML page"""
+    cube = snapshot['cube']
+    filters = resolve_preset(snapshot, preset)
+    cells = select_cells(cube, filters)
+    positions = cube_positions(cube, cells)
+
+    html = [
+        '<!DOCTYPE html><html><head><meta charset="utf-8">',
+        f'<title>{escape(preset["name"])} - VMware Certification Dashboard 2026</title>',
+        DASHBOARD_CSS, REPORT_CSS, '</head><body>',
+        '<p class="main-header">🎯 VMware Certification Dashboard 2026</p>',
+        f'<h3>{escape(preset["name"])}</h3>',
+        f'<p class="report-meta">{escape(describe_filters(preset.get("filters")))}<br>'
+        f'Data version {snapshot["version"][:12]} | Generated {generated_at}</p>'
+    ]
+
+    # KPI cards
+    kpis = compute_kpis(cube, cells)
+    html.append('<div class="kpi-row">')
+    for title, key, card_style, text_style in KPI_CARDS:
+        html.append(build_kpi_card_html(title, kpis[key], card_style, text_style))
+    html.append('</div><hr>')
+
+    # Charts - the first one carries plotly.js so the file works offline
+    figures = []
+    if 'Category' in cube['dimensions']:
+        figures.append(('📊 Certifications by Category', build_category_pie(cube_counts(cube, cells, ['Category']))))
+    figures.append(('📈 Status Distribution', build_status_pie(cube_counts(cube, cells, ['Status']))))
+    if 'Enablement Area' in cube['dimensions']:
+        figures.append(('📊 Enablement Areas', build_area_bar(cube_counts(cube, cells, ['Enablement Area']))))
+    if 'Category' in cube['dimensions']:
+        category_status = cube_counts(cube, cells, ['Category', 'Status']).unstack(fill_value=0).sort_index().sort_index(axis=1)
+        figures.append(('📊 Category-wise Status', build_category_status_bar(category_status)))
+
+    html.append('<div class="chart-row">')
+    for i, (title, fig) in enumerate(figures):
+        html.append(f'<div><p class="sub-header">{title}</p>')
+        html.append(fig.to_html(full_html=False, include_plotlyjs=(i == 0)))
+        html.append('</div>')
+    html.append('</div>')
+
+    html.append('<p class="sub-header">📅 Certification Timeline</p>')
+    timeline_counts = cube_counts(cube, cells, ['Target Date', 'Status']) if 'Target Date' in cube['dimensions'] else pd.Series(dtype=int)
+    if not timeline_counts.empty:
+        html.append(build_timeline(timeline_counts).to_html(full_html=False, include_plotlyjs=not figures))
+    else:
+        html.append('<p>Target Date data not available</p>')
+
+    # Tables
+    html.append('<p class="sub-header">📋 Detailed Certification Plan</p>')
+    detail_df = select_columns(snapshot, positions, DETAIL_COLUMNS, formatted=True)
+    if 'Status' in detail_df.columns:
+        detail_df['Status'] = snapshot['status_badges'].iloc[positions]
+    html.append(detail_df.to_html(index=False, classes='detail', border=0, na_rep=''))
+
+    html.append('<p class="sub-header">👥 Engineer Summary</p>')
+    if 'Engineer Name' in snapshot['df'].columns and len(positions) > 0:
+        html.append(build_engineer_summary_html(
+            select_columns(snapshot, positions, ['Engineer Name', 'Category', 'Assigned Certification', 'Status'])
+        ))
+
+    html.append('<p class="sub-header">⏰ Upcoming Deadlines (Next 7 Days)</p>')
+    deadline_df = select_columns(snapshot, positions, ['Target Date', 'Status'])
+    upcoming = positions[:0]
+    if 'Target Date' in deadline_df.columns:
+        today = pd.Timestamp.now().normalize()
+        upcoming = positions[(
+            (deadline_df['Target Date'] >= today) &
+            (deadline_df['Target Date'] <= today + pd.Timedelta(days=7)) &
+            (deadline_df['Status'] != 'Completed')
+        ).to_numpy()]
+    if len(upcoming) > 0:
+        html.append(build_deadlines_html(select_columns(snapshot, upcoming, DEADLINE_COLUMNS, formatted=True)))
+    else:
+        html.append('<p>No upcoming deadlines in the next 7 days</p>')
+
+    html.append('</body></html>')
+    return '\n'.join(html)
+
+
+# Process pool workers build the snapshot once, then render whichever presets they're handed
+_worker_snapshot = None
+
+
+def _init_worker(content):
+    global _worker_snapshot
+    _worker_snapshot = get_snapshot(content)
+
+
+def _render_in_worker(preset, generated_at):
+    return preset['slug'], render_report(_worker_snapshot, preset, generated_at)
+
+
+def write_reports(content, presets, reports_dir=REPORTS_DIR, workers=None):
+    """Render every preset in parallel and write the reports plus their manifest"""
+    snapshot = get_snapshot(content, warn=lambda message: print(message, file=sys.stderr))
+    now = datetime.now()
+    generated_at = now.strftime('%Y-%m-%d %H:%M:%S')
+    os.makedirs(reports_dir, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(content,)) as pool:
+        rendered = pool.map(_render_in_worker, presets, [generated_at] * len(presets))
+        for slug, html in rendered:
+            path = os.path.join(reports_dir, f'{slug}.html')
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                f.write(html)
+            os.replace(path + '.tmp', path)
+
+    manifest = {
+        'version': snapshot['version'],
+        'generated_at': generated_at,
+        'rendered_on': now.date().isoformat(),
+        'reports': [dict(preset, file=f"{preset['slug']}.html") for preset in presets]
+    }
+    manifest_path = os.path.join(reports_dir, MANIFEST_NAME)
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workbook', help='render from this .xlsx instead of downloading the live sheet')
+    parser.add_argument('--presets', default=PRESETS_PATH, help='preset list (default: report_presets.json)')
+    parser.add_argument('--out', default=REPORTS_DIR, help='report directory (default: reports/)')
+    parser.add_argument('--workers', type=int, help='process pool size (default: one per CPU)')
+    parser.add_argument('--force', action='store_true', help='render even if the reports are current')
+    parser.add_argument('--watch', type=int, metavar='SECONDS', help='poll for new data versions (and new days) every SECONDS')
+    args = parser.parse_args()
+
+    while True:
+        if args.workbook:
+            with open(args.workbook, 'rb') as f:
+                content = f.read()
+        else:
+            content = fetch_workbook()
+
+        manifest = load_manifest(args.out)
+        version = get_snapshot(content)['version']
+        if args.force or not is_current(manifest, version):
+            start = time.perf_counter()
+            presets = load_presets(args.presets)
+            write_reports(content, presets, args.out, args.workers)
+            print(f"Rendered {len(presets)} report(s) for data version {version[:12]} "
+                  f"in {time.perf_counter() - start:.1f}s -> {args.out}")
+            args.force = False
+        else:
+            print(f"Data version {version[:12]} unchanged and already rendered today; reports are current")
+
+        if not args.watch:
+            break
+        time.sleep(args.watch)
+
+
+if __name__ == '__main__':
+    main()